@@ -93,10 +93,12 @@ ctypes.windll.user32.ShowWindow(ctypes.windll.kernel32.GetConsoleWindow(), 0)
 
 # Imports remaining required modules
 import stddraw # StdDraw module is used as a basic graphics library
-import random # Used for creating tetrominoes with random types/shapes
-from game_grid import GameGrid # Class for modeling the game grid
-from tetromino import Tetromino # Class for modeling the tetrominoes
+from game_engine import GameEngine, DROP_SPEEDS # Class for running the rules of the game and the drop speeds
+from clock import VirtualClock # Class for measuring the simulated time of the game and the delays of the moves
+from grid_renderer import GridRenderer # Class for drawing the game grid and animating its events
+from replay import ReplayWriter # Class for recording the games into replay files
 from picture import Picture # Used representing images to display
+import assets # Used for loading the images once and sharing them between the menus
 from color import Color # Used for coloring the game menu
 import base64 # Used for decoding some secrets
 from data import DATAS # Imports some secret data
@@ -116,9 +118,12 @@ config.read("config.ini")
 if not config.has_section("GAME"):
    config.add_section("GAME")
    config.set('GAME', "difficulty", "1")
+   config.set('GAME', "fps", "60")
 else:
    if not config.has_option("GAME", "difficulty"):
       config.set('GAME', "difficulty", "1")
+   if not config.has_option("GAME", "fps"):
+      config.set('GAME', "fps", "60")
 
 # Checks the configuration for having sound section
 if not config.has_section("SOUND"):
@@ -164,7 +169,7 @@ else:
 for i in config.sections():
    if i == 'SOUND' or i == 'GAME' or i == 'LEADERBOARD':
       for j in config.options(i):
-         if (i == 'SOUND' and j != "music_volume" and j != "effects_volume") or (i == 'GAME' and j != "difficulty") or (i == 'LEADERBOARD' and j != "hs_tetris_easy" and j != "hs_tetris_normal" and j != "hs_tetris_hard" and j != "hs_tetris_extreme" and j != "hs_2048_easy" and j != "hs_2048_normal" and j != "hs_2048_hard" and j != "hs_2048_extreme"):
+         if (i == 'SOUND' and j != "music_volume" and j != "effects_volume") or (i == 'GAME' and j != "difficulty" and j != "fps") or (i == 'LEADERBOARD' and j != "hs_tetris_easy" and j != "hs_tetris_normal" and j != "hs_tetris_hard" and j != "hs_tetris_extreme" and j != "hs_2048_easy" and j != "hs_2048_normal" and j != "hs_2048_hard" and j != "hs_2048_extreme"):
             config.remove_option(i, j)
    else:
       config.remove_section(i)
@@ -176,6 +181,13 @@ try:
 except ValueError:
    config.set('GAME', "difficulty", "1")
 
+# Checks the target FPS option for being valid
+try:
+   if int(config.get("GAME", "fps")) < 1 or int(config.get("GAME", "fps")) > 1000:
+      config.set('GAME', "fps", "60")
+except ValueError:
+   config.set('GAME', "fps", "60")
+
 # Checks the music volume option for being valid
 try:
    if int(config.get("SOUND", "music_volume")) < 0 or int(config.get("SOUND", "music_volume")) > 100:
@@ -261,8 +273,12 @@ TEMP_FILE = tempfile.gettempdir()
 ICON = DIR + "/images/icon.png"
 TEMP_IMAGE = TEMP_FILE + "/canvas.png"
 TEMP_INFO = TEMP_FILE + "/image.png"
+REPLAY_DIR = DIR + "/replays"
 GRID_H = 20
 GRID_W = 12
+STEP_MS = 10
+MAX_CATCH_UP_MS = 50
+MENU_WAIT_MS = 1000
 CANVAS_H = 35 * GRID_H + 1
 CANVAS_W = 35 * GRID_W + 140
 CENTER_X = ((GRID_W + 4 + 1)/2)-1
@@ -280,6 +296,7 @@ merge = AudioPlayer(DIR + "/sounds/merge.wav")
 
 # Initializes global variables for all game settings
 difficulty = int(config.get("GAME", "difficulty"))
+fps = int(config.get("GAME", "fps"))
 hs_tetris_easy = int(config.get("LEADERBOARD", "hs_tetris_easy"))
 hs_tetris_normal = int(config.get("LEADERBOARD", "hs_tetris_normal"))
 hs_tetris_hard = int(config.get("LEADERBOARD", "hs_tetris_hard"))
@@ -293,6 +310,7 @@ effects_volume = int(config.get("SOUND", "effects_volume"))
 gamemode = None
 timer = None
 is_connected = None
+recorder = None
 
 
 # MAIN FUNCTION OF THE PROGRAM
@@ -302,6 +320,7 @@ is_connected = None
 def start():
    # Gets the globals
    global gamemode
+   global fps
    global music_volume
    global effects_volume
    global player
@@ -325,6 +344,10 @@ def start():
    stddraw.setWindowTitle(WINDOW_TITLE)
    stddraw.setWindowIcon(ICON)
    stddraw.setCloseAction(close)
+   # Limits the frames drawn per second so that the game does not use a whole CPU core
+   stddraw.setFrameRate(fps)
+   # Loads the images of the menus once in the format of the window
+   assets.preload()
 
    # Sets the audio players' volumes by settings
    player.volume = music_volume
@@ -366,6 +389,7 @@ def game():
    global gamemode
    global clear
    global merge
+   global recorder
 
    # Modifies the canvas for more functionality and cleanness
    stddraw.setKeyRepeat(1)
@@ -382,20 +406,25 @@ def game():
    update_presence(state=mode, details=detail, large_image="icon", start=current_time)
 
    # Sets the milliseconds of standart drop based on the difficulty
-   ms = (350 if difficulty == 0 else (250 if difficulty == 1 else (125 if difficulty == 2 else 75)))
+   ms = DROP_SPEEDS[difficulty]
 
-   # Creates the game grid
-   grid = GameGrid(GRID_H, GRID_W, gamemode, difficulty)
+   # Creates the game engine with the game grid, the current tetromino and the next three tetrominoes, the tetrominoes
+   # are created from a random seed and the delays of the moves are measured with the simulation steps of the game
+   engine = GameEngine(GRID_H, GRID_W, gamemode, difficulty, clock=VirtualClock())
+   grid = engine.grid
+   current_tetromino = engine.current_tetromino
 
-   # Creates the current tetromino and the next three tetrominoes by using the create_tetromino function defined below
-   tetrominos = [create_tetromino(GRID_H, GRID_W), create_tetromino(GRID_H, GRID_W), create_tetromino(GRID_H, GRID_W), create_tetromino(GRID_H, GRID_W)]
+   # Records the game into a replay file, every action applied to the game is recorded with the tick it is applied at
+   # The replays of the games started in the same second get numbered names instead of overwriting each other
+   recorder = ReplayWriter(REPLAY_DIR + "/" + time.strftime("%Y%m%d-%H%M%S") + "-" + gamemode + ".t2r", gamemode, difficulty, engine.generator.seed, GRID_H, GRID_W, tick_ms=STEP_MS)
 
-   # Sets the tetrominoes on the grid
-   current_tetromino = tetrominos.pop(0)
-   grid.current_tetromino = current_tetromino
-   grid.next_tetromino1 = tetrominos[0]
-   grid.next_tetromino2 = tetrominos[1]
-   grid.next_tetromino3 = tetrominos[2]
+   # The game goes forward in simulation steps of STEP_MS milliseconds, the skipped time is the time that the game does
+   # not go forward in (the pause menu and the animations)
+   skipped_time = 0
+
+   # Creates the renderer that draws the game grid and plays the animations and the effects of its events
+   # The ghost of the current tetromino is shown if difficulty is not extreme
+   renderer = GridRenderer(grid, {"clear": clear, "merge": merge}, show_ghost=(difficulty != 3))
 
    # Sets the high score of the current game mode and difficulty
    if gamemode == "tetris":
@@ -410,13 +439,30 @@ def game():
    already_rotated = False
    already_dropped = False
 
-   # The main game loop
+   # The main game loop, every iteration is a simulation step, the game is drawn when the simulation catches up with the real time
    while True:
+      # Skips the time that the simulation is behind by more than MAX_CATCH_UP_MS (e.g. after the window is dragged or the
+      # computer wakes up from sleep), so the game does not run many steps at once without drawing them
+      behind_time = time.time()*1000 - current_time - skipped_time - engine.clock.now()
+      if behind_time > MAX_CATCH_UP_MS:
+         skipped_time += behind_time - MAX_CATCH_UP_MS
+
+      # Draws the game grid if the simulation is caught up, drawing waits for the next frame by the target FPS
+      if engine.clock.now() + STEP_MS > time.time()*1000 - current_time - skipped_time:
+         renderer.display()
+         continue
+
+      # Moves the simulation forward by one step
+      engine.clock.advance(STEP_MS)
+
       # Gets the mouse positions and keys types
       posX = round(stddraw.mouseMotionX())
       posY = round(stddraw.mouseMotionY())
       keys_typed = stddraw.getKeysTyped()
 
+      # Gets the current tick of the game for the replay
+      tick = int(engine.clock.now() // STEP_MS)
+
       # Sets the drop situation of the current tetromino for checking hard drop
       dropped = False
       
@@ -431,53 +477,56 @@ def game():
 
       # Checks the events for keyboard
       if not mouse:
-         # Hard drop if user pressed Space
-         if "space" in keys_typed:
-            # Moves down the tetromino all the way down until it cannot go further
-            if not already_dropped:
-               count = 0
-               while True:
-                  sc = current_tetromino.move("down", grid, 1)
-                  if not sc:
-                     break
-                  else:
-                     count += 1
-               dropped = True
-               already_dropped = True
-               # Increases the score by line count * 2
-               grid.score += count * 2
          # Rotates if user pressed Up or W
          if "up" in keys_typed or "w" in keys_typed:
             if not already_rotated:
                can_rotate = current_tetromino.rotate(grid)
                if can_rotate:
+                  recorder.record(tick, "rotate")
                   rotate.play()
                   already_rotated = True
          # Moves left if user pressed Left or A
          if "left" in keys_typed or "a" in keys_typed:
             can_left = current_tetromino.move("left", grid, 1, delay=150)
             if can_left:
+               recorder.record(tick, "left")
                move.play()
          # Moves right if user pressed Right or D
          if "right" in keys_typed or "d" in keys_typed:
             can_right = current_tetromino.move("right", grid, 1, delay=150)
             if can_right:
+               recorder.record(tick, "right")
                move.play()
          # Soft drops if user pressed Down or S
          if "down" in keys_typed or "s" in keys_typed:
             succ = current_tetromino.move("down", grid, 1, delay=50)
             # Increases the score by 1 if tetromino can go down
             if succ:
+               recorder.record(tick, "soft_drop")
                grid.score += 1
+         # Hard drop if user pressed Space, after the other moves so that the tetromino is placed right after it is dropped
+         if "space" in keys_typed:
+            # Moves down the tetromino all the way down until it cannot go further
+            if not already_dropped:
+               count = current_tetromino.drop(grid)
+               recorder.record(tick, "hard_drop")
+               dropped = True
+               already_dropped = True
+               # Increases the score by line count * 2
+               grid.score += count * 2
          # Pauses if user pressed Escape
          if "escape" in keys_typed:
+            pause_time = time.time()*1000
             option = display_pause_menu()
+            skipped_time += time.time()*1000 - pause_time
 
-            # If user wants to go the the menu, break the loop and go
+            # If user wants to go the the menu, ends the replay, breaks the loop and goes
             if option == "menu":
+               recorder.close(grid.score)
                return False
-            # If user wants to restart the game, break the loop and restart
+            # If user wants to restart the game, ends the replay, breaks the loop and restarts
             elif option == "restart":
+               recorder.close(grid.score)
                return True
          # If user releases a key, check the statements below
          if stddraw.hasNextKeyReleased():
@@ -507,6 +556,7 @@ def game():
                if not success_move:
                   break
                else:
+                  recorder.record(tick, "left")
                   if not already_rotated:
                      move.play()
          # Moves right if user pulls the mouse to the right
@@ -516,6 +566,7 @@ def game():
                if not success_move:
                   break
                else:
+                  recorder.record(tick, "right")
                   if not already_rotated:
                      move.play()
          
@@ -526,19 +577,15 @@ def game():
             if grid.is_inside(round(stddraw.mouseRightY()), round(stddraw.mouseRightX())):
                success_rotate = current_tetromino.rotate(grid)
                if success_rotate:
+                  recorder.record(tick, "rotate")
                   rotate.play()
                   already_rotated = True
          # Hard drops if user clicked the mouse left button
          if stddraw.mouseLeftPressed():
             if grid.is_inside(round(stddraw.mouseLeftY()), round(stddraw.mouseLeftX())):
                # Moves down the tetromino all the way down until it cannot go further
-               count = 0
-               while True:
-                  sc = current_tetromino.move("down", grid, 1)
-                  if not sc:
-                     break
-                  else:
-                     count += 1
+               count = current_tetromino.drop(grid)
+               recorder.record(tick, "hard_drop")
                dropped = True
                # Increases the score by line count * 2
                grid.score += count * 2
@@ -548,6 +595,7 @@ def game():
                succ = current_tetromino.move("down", grid, 1, delay=50)
                # Increases the score by 1 if tetromino can go down
                if succ:
+                  recorder.record(tick, "soft_drop")
                   grid.score += 1
 
       # Clears all the user interactions
@@ -555,33 +603,26 @@ def game():
       stddraw.clearKeysTyped()
       stddraw.clearKeysReleased()
       
-      # If difficulty is not extreme, creates the ghost of the current tetromino and moves down the ghost all the way down until it cannot go further
-      if difficulty != 3:
-         current_ghost = current_tetromino.copy(ghost=True)
-         grid.current_ghost = current_ghost
-         
-         while True:
-            sc = current_ghost.move("down", grid, 1)
-            if not sc:
-               break
-      
       # Moves the tetromino down by the determined milliseconds delay if it is not dropped
       if not dropped:
          success = current_tetromino.move("down", grid, 1, delay=ms, standart=True)
+         # Records the move as a gravity step if it is done, the tetromino is placed by it if it cannot go down
+         if success is not None:
+            recorder.record(tick, "gravity")
 
       # Places the tetromino on the game grid when it cannot go down anymore or dropped already
       if dropped or success == False:
          place.play()
-         # Gets the tile matrix of the tetromino
-         tiles_to_place = current_tetromino.tile_matrix
-         # Deletes the ghost
-         grid.current_ghost = None
-         # Updates the game grid by adding the tiles of the tetromino
-         grid.update_grid(tiles_to_place)
-
-         # If game is over, writes the config if a new high score value exists and breaks the loop
+         # Places the tetromino on the game grid, does the merging and line clearing, and gets the next tetromino, the
+         # time of the animations is skipped
+         lock_time = time.time()*1000
+         engine.lock()
+         skipped_time += time.time()*1000 - lock_time
+
+         # If game is over, ends the replay, writes the config if a new high score value exists and breaks the loop
          if grid.game_over:
-            grid.display()
+            recorder.close(grid.score)
+            renderer.display()
             if grid.new_high_score is not None:
                if gamemode == "tetris":
                   if difficulty == 0:
@@ -613,32 +654,14 @@ def game():
                with open('config.ini', 'w') as f:
                   config.write(f)
             break
-         
-         # Does chain merging and line clearing until it cannot if the game mode is 2048
-         if gamemode == "2048":
-            while True:
-               grid.check_line_chain_merge(merge)
-               score_before_line_delete = grid.score
-               grid.delete_full_lines(clear)
-               if score_before_line_delete == grid.score:
-                  break
-         # Checks the lines only if the game mode is Tetris
-         else:
-            grid.delete_full_lines(clear)
-
-         # Creates the next tetromino to enter the game grid by using the create_tetromino function defined below
-         tetromino = create_tetromino(GRID_H, GRID_W)
-         tetrominos.append(tetromino)
 
-         # Sets the current tetromino and the next tetrominoes
-         current_tetromino = tetrominos.pop(0)
-         grid.next_tetromino1 = tetrominos[0]
-         grid.next_tetromino2 = tetrominos[1]
-         grid.next_tetromino3 = tetrominos[2]
-         grid.current_tetromino = current_tetromino
+         # Clears the user interactions made during the merge animations if the game mode is 2048
+         if gamemode == "2048":
+            stddraw.clearKeysTyped()
+            stddraw.clearMousePresses()
 
-      # Display the game grid
-      grid.display()
+         # Gets the next tetromino
+         current_tetromino = engine.current_tetromino
    
    # Disables repeated key events
    stddraw.setKeyRepeat()
@@ -656,6 +679,8 @@ def game():
          return True
       stddraw.clearKeysTyped()
       stddraw.show(0)
+      # Waits for a user interaction before drawing again, the screen is still drawn again every MENU_WAIT_MS milliseconds
+      stddraw.waitForEvents(MENU_WAIT_MS)
 
 
 # CLOSE HANDLER
@@ -673,6 +698,7 @@ def close():
    global clear
    global menu
    global merge
+   global recorder
 
    if timer.is_alive():
       timer.cancel()
@@ -681,6 +707,10 @@ def close():
    with open('config.ini', 'w') as f:
       config.write(f)
 
+   # Closes the replay of the current game without its end
+   if recorder is not None:
+      recorder.close()
+
    # Deletes the temporary files if they exist
    if os.path.exists(TEMP_IMAGE):
       os.remove(TEMP_IMAGE)
@@ -703,25 +733,6 @@ def close():
    sys.exit()
 
 
-# CREATE TETROMINO
-# ------------------------------
-# Function for creating random shaped tetrominoes to enter the game grid.
-
-def create_tetromino(grid_height, grid_width):
-   # Gets the global
-   global gamemode
-
-   # Determines a have random tetromino shape and bottom left corner position
-   tetromino_types = [ 'I', 'O', 'Z', 'S', 'L', 'J', 'T' ]
-   random_index = random.randint(0, len(tetromino_types) - 1)
-   random_type = tetromino_types[random_index]
-   n = (4 if random_type == 'I' else (2 if random_type == 'O' else 3))
-   bottom_x = random.randint(0, grid_width - n)
-
-   # Creates and returns a tetromino with the given shape and bottom left corner position
-   return Tetromino(random_type, grid_height, grid_width, bottom_x, gamemode=gamemode)
-
-
 # DISPLAY GAME MENU
 # ------------------------------
 # Function for displaying a simple menu before starting the game.
@@ -756,24 +767,24 @@ def display_game_menu():
    # Clears the background canvas to background color
    stddraw.clear(background_color)
 
-   # Initializes picture objects with their paths
-   image_to_display = Picture(DIR + "/images/menu_image.png")
-   tetris= Picture(DIR + "/images/tetris.png")
-   tetris2= Picture(DIR + "/images/tetris2.png")
-   i2048 = Picture(DIR + "/images/2048.png")
-   i2048L = Picture(DIR + "/images/2048L.png")
-   musicOn = Picture(DIR + "/images/musicOn.png")
-   musicOff = Picture(DIR + "/images/musicOff.png")
-   soundOff = Picture(DIR + "/images/soundOff.png")
-   soundOn = Picture(DIR + "/images/soundOn.png")
-   easy = Picture(DIR + "/images/easy.png")
-   normal = Picture(DIR + "/images/normal.png")
-   hard = Picture(DIR + "/images/hard.png")
-   extreme = Picture(DIR + "/images/extreme.png")
-   help = Picture(DIR + "/images/help.png")
-   scores = Picture(DIR + "/images/scores.png")
-   connected = Picture(DIR + "/images/connected.png")
-   disconnected = Picture(DIR + "/images/disconnected.png")
+   # Gets the picture objects of the images, they are loaded only once
+   image_to_display = assets.get_picture("menu_image.png")
+   tetris= assets.get_picture("tetris.png")
+   tetris2= assets.get_picture("tetris2.png")
+   i2048 = assets.get_picture("2048.png")
+   i2048L = assets.get_picture("2048L.png")
+   musicOn = assets.get_picture("musicOn.png")
+   musicOff = assets.get_picture("musicOff.png")
+   soundOff = assets.get_picture("soundOff.png")
+   soundOn = assets.get_picture("soundOn.png")
+   easy = assets.get_picture("easy.png")
+   normal = assets.get_picture("normal.png")
+   hard = assets.get_picture("hard.png")
+   extreme = assets.get_picture("extreme.png")
+   help = assets.get_picture("help.png")
+   scores = assets.get_picture("scores.png")
+   connected = assets.get_picture("connected.png")
+   disconnected = assets.get_picture("disconnected.png")
 
    # Dimensions of the buttons
    button_w, button_h = GRID_W, 2.30
@@ -1000,6 +1011,11 @@ def display_game_menu():
       stddraw.show(0)
       stddraw.clear(background_color)
 
+      # Waits for a user interaction before drawing again if there is no typed key left to check, the screen is still
+      # drawn again every MENU_WAIT_MS milliseconds
+      if not stddraw.hasNextKeyTyped():
+         stddraw.waitForEvents(MENU_WAIT_MS)
+
 
 # GET DATA
 # ------------------------------
@@ -1014,9 +1030,9 @@ def get_data(number):
 # A method for showing the controls to the user.
 
 def display_controls(background_color):
-   # Initializes picture objects with their paths
-   help = Picture(DIR + "/images/help.png")
-   controls = Picture(DIR + "/images/controls.png")
+   # Gets the picture objects of the images, they are loaded only once
+   help = assets.get_picture("help.png")
+   controls = assets.get_picture("controls.png")
 
    # Coordinates of the center of the hover button
    help_x, help_y = CENTER_X + 7.75, CENTER_Y + 9.75
@@ -1040,6 +1056,9 @@ def display_controls(background_color):
       stddraw.picture(help, help_x, help_y)
       stddraw.show(0)
 
+      # Waits for a user interaction before drawing again, the screen is still drawn again every MENU_WAIT_MS milliseconds
+      stddraw.waitForEvents(MENU_WAIT_MS)
+
 
 # DISPLAY PAUSE MENU
 # ------------------------------
@@ -1069,14 +1088,14 @@ def display_pause_menu():
    # Clears the background canvas to background_color
    stddraw.clear(background_color)
 
-   # Initializes picture objects with their paths
-   musicOn = Picture(DIR + "/images/musicOn.png")
-   musicOff = Picture(DIR + "/images/musicOff.png")
-   soundOff = Picture(DIR + "/images/soundOff.png")
-   soundOn = Picture(DIR + "/images/soundOn.png")
-   blur = Picture(DIR + "/images/pause_blur.png")
+   # Gets the picture objects of the images, they are loaded only once (except the screenshot)
+   musicOn = assets.get_picture("musicOn.png")
+   musicOff = assets.get_picture("musicOff.png")
+   soundOff = assets.get_picture("soundOff.png")
+   soundOn = assets.get_picture("soundOn.png")
+   blur = assets.get_picture("pause_blur.png")
    canvas = Picture(TEMP_IMAGE)
-   help = Picture(DIR + "/images/help.png")
+   help = assets.get_picture("help.png")
 
    # Coordinates of the center of the hover button
    help_x, help_y = CENTER_X + 7.75, CENTER_Y + 9.75
@@ -1234,6 +1253,9 @@ def display_pause_menu():
          first = False
       stddraw.clear(background_color)
 
+      # Waits for a user interaction before drawing again, the screen is still drawn again every MENU_WAIT_MS milliseconds
+      stddraw.waitForEvents(MENU_WAIT_MS)
+
 
 # DISPLAY INFO
 # ------------------------------
@@ -1297,6 +1319,9 @@ def display_info():
       stddraw.show(0)
       stddraw.clear()
 
+      # Waits for a user interaction before drawing again, the screen is still drawn again every MENU_WAIT_MS milliseconds
+      stddraw.waitForEvents(MENU_WAIT_MS)
+
 
 # SET MUSIC VOLUME
 # ------------------------------
@@ -1382,8 +1407,8 @@ def display_scores():
    global hs_2048_hard
    global hs_2048_extreme
 
-   # Initializes the picture object with its path
-   scores = Picture(DIR + "/images/scores.png")
+   # Gets the picture object of the image, it is loaded only once
+   scores = assets.get_picture("scores.png")
 
    # Coordinates of the center of the hover button
    scores_x, scores_y = CENTER_X - 7.75, CENTER_Y + 9.75
@@ -1472,6 +1497,9 @@ def display_scores():
       # Shows the canvas
       stddraw.show(0)
 
+      # Waits for a user interaction before drawing again, the screen is still drawn again every MENU_WAIT_MS milliseconds
+      stddraw.waitForEvents(MENU_WAIT_MS)
+
 
 # CAN CONNECT
 # ------------------------------
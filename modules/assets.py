@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# add the current directory to the system path
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+from picture import Picture # class for the images loaded from the files
+
+# the directory of the images of the game
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "images")
+
+# the images that are not loaded by preload() since they are rarely shown (the controls and the pause menu) or not
+# drawn as pictures (the window icon), they are loaded when they are used for the first time
+LAZY_IMAGES = ("controls.png", "pause_blur.png", "icon.png")
+
+# the loaded pictures by their file names, shared by the whole game
+_pictures = {}
+
+# Function for getting the picture of the image with the given file name in the images directory. The image is
+# loaded once and the same picture is returned every time, so the returned pictures must not be changed. Its pixels
+# are converted to the format of the display once the window is created, so drawing it does not convert them again.
+def get_picture(name):
+   picture = _pictures.get(name)
+   if picture is None:
+      picture = Picture(os.path.join(IMAGE_DIR, name))
+      _pictures[name] = picture
+   picture.convert()
+   return picture
+
+# Function for loading all the images in the images directory except the lazy ones, used for loading them before
+# they are needed (e.g. after the window is created when the game starts)
+def preload():
+   for name in sorted(os.listdir(IMAGE_DIR)):
+      if name.endswith(".png") and name not in LAZY_IMAGES:
+         get_picture(name)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# add the current directory to the system path
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import argparse # used for parsing the command line arguments
+import importlib # used for loading the policies given by their module paths
+import json # used for writing the results file
+import random # used for seeding the games and the policies
+import time # used for timing the games
+from concurrent.futures import ProcessPoolExecutor # used for playing the games on multiple processes
+from game_engine import GameEngine, DROP_SPEEDS # class for running the rules of a game without drawing anything
+from piece_generator import PieceGenerator, RANDOMIZERS # class for creating the tetrominoes from a seed
+
+# the dimensions of the game grid
+GRID_H = 20
+GRID_W = 12
+
+# Class used for a policy that takes a random action in every frame. A policy is created with the random number
+# generator of the game and it is called with the game engine in every frame to get the action to take.
+class RandomPolicy:
+   # Constructor that creates the policy with the given random number generator
+   def __init__(self, rng):
+      self.rng = rng
+
+   # Method for getting the action to take on the given game engine
+   def __call__(self, engine):
+      return self.rng.choice(("none", "left", "right", "rotate", "soft_drop", "hard_drop"))
+
+# Class used for a policy that rotates every tetromino randomly, moves it to a random column and drops it
+class RandomDropPolicy:
+   # Constructor that creates the policy with the given random number generator
+   def __init__(self, rng):
+      self.rng = rng
+      # the tetromino that the target orientation and column are chosen for
+      self.tetromino = None
+
+   # Method for getting the action to take on the given game engine
+   def __call__(self, engine):
+      tetromino = engine.current_tetromino
+      # choose a random orientation and column for every new tetromino
+      if tetromino is not self.tetromino:
+         self.tetromino = tetromino
+         self.orientation = self.rng.randint(0, 3)
+         self.column = self.rng.randint(0, engine.grid_width - 1)
+      if tetromino.orientation != self.orientation:
+         return "rotate"
+      if tetromino.leftmost < self.column and tetromino.leftmost + tetromino.column_count < engine.grid_width:
+         return "right"
+      if tetromino.leftmost > self.column:
+         return "left"
+      return "hard_drop"
+
+# the policies that can be given by their names, other policies can be given as "module:name"
+POLICIES = {
+   "random": RandomPolicy,
+   "random_drop": RandomDropPolicy,
+}
+
+# Function for getting the policy with the given name or "module:name" path
+def load_policy(name):
+   if name in POLICIES:
+      return POLICIES[name]
+   module_name, _, attribute = name.partition(":")
+   if attribute == "":
+      raise ValueError("Unknown policy: " + name)
+   return getattr(importlib.import_module(module_name), attribute)
+
+# Function for playing a game with the given settings until it is over or the step limit is reached, returns the
+# results of the game
+def play_game(gamemode, difficulty, seed, policy_name, max_steps, randomizer="uniform"):
+   # seed the tetrominoes of the game and the policy with the seed of the game
+   policy = load_policy(policy_name)(random.Random("policy-" + str(seed)))
+   start = time.perf_counter()
+   generator = PieceGenerator(GRID_H, GRID_W, gamemode, seed, randomizer)
+   engine = GameEngine(GRID_H, GRID_W, gamemode, difficulty, generator)
+
+   steps = pieces = lines_cleared = merges = max_chain = 0
+   while not engine.grid.game_over and steps < max_steps:
+      tetromino = engine.current_tetromino
+      # the policy takes one action in every simulated frame
+      events = engine.frame(policy(engine))
+      steps += 1
+      # count the placed tetrominoes, the cleared lines and the merges of the step, and get the depth of the
+      # cascade of merges and line clears if a tetromino is placed
+      if engine.current_tetromino is not tetromino:
+         pieces += 1
+         max_chain = max(max_chain, engine.last_chain)
+      for (kind, data) in events:
+         if kind == "clear":
+            lines_cleared += len(data)
+         elif kind == "merge":
+            merges += 1
+
+   return {
+      "seed": seed,
+      "score": engine.grid.score,
+      "steps": steps,
+      "pieces": pieces,
+      "lines_cleared": lines_cleared,
+      "merges": merges,
+      "max_chain": max_chain,
+      "reached_2048": engine.grid.reached_2048,
+      "game_over": engine.grid.game_over,
+      "seconds": time.perf_counter() - start,
+   }
+
+# Function for getting the count, mean, minimum and maximum of the given values
+def summarize(values):
+   return {
+      "count": len(values),
+      "mean": sum(values) / len(values) if len(values) != 0 else 0,
+      "min": min(values, default=0),
+      "max": max(values, default=0),
+   }
+
+# Function for playing the games of the given seeds on multiple processes, returns the results of every game and
+# their summary
+def run_batch(gamemode, difficulty, seeds, policy_name="random", max_steps=100000, workers=None, randomizer="uniform"):
+   # check the policy before starting the processes
+   load_policy(policy_name)
+   seeds = list(seeds)
+   start = time.perf_counter()
+   with ProcessPoolExecutor(max_workers=workers) as executor:
+      games = list(executor.map(play_game, [gamemode] * len(seeds), [difficulty] * len(seeds), seeds,
+                                [policy_name] * len(seeds), [max_steps] * len(seeds), [randomizer] * len(seeds)))
+   summary = {
+      "gamemode": gamemode,
+      "difficulty": difficulty,
+      "policy": policy_name,
+      "randomizer": randomizer,
+      "games": len(games),
+      "batch_seconds": time.perf_counter() - start,
+   }
+   for key in ("score", "steps", "pieces", "lines_cleared", "merges", "max_chain", "seconds"):
+      summary[key] = summarize([game[key] for game in games])
+   summary["reached_2048"] = sum(1 for game in games if game["reached_2048"])
+   return {"summary": summary, "games": games}
+
+# Function for running the batch given by the command line arguments and writing its results file
+def main(argv=None):
+   parser = argparse.ArgumentParser(description="Plays many Tetris 2048 games at once without drawing them.")
+   parser.add_argument("--mode", choices=("tetris", "2048"), default="2048", help="game mode")
+   parser.add_argument("--difficulty", type=int, choices=range(len(DROP_SPEEDS)), default=1,
+                       help="0 (easy), 1 (normal), 2 (hard) or 3 (extreme)")
+   parser.add_argument("--seeds", default="0:100", help="seed range as start:stop, or a single seed count")
+   parser.add_argument("--policy", default="random",
+                       help="policy name (" + ", ".join(POLICIES) + ") or module:name")
+   parser.add_argument("--randomizer", choices=RANDOMIZERS, default="uniform", help="how the tetromino types are chosen")
+   parser.add_argument("--max-steps", type=int, default=100000, help="step limit of a game")
+   parser.add_argument("--workers", type=int, default=None, help="number of processes")
+   parser.add_argument("--output", default="results.json", help="path of the results file")
+   args = parser.parse_args(argv)
+
+   start, _, stop = args.seeds.partition(":")
+   seeds = range(int(start), int(stop)) if stop != "" else range(int(start))
+   results = run_batch(args.mode, args.difficulty, seeds, args.policy, args.max_steps, args.workers, args.randomizer)
+   with open(args.output, "w") as file:
+      json.dump(results, file, indent=2)
+
+   summary = results["summary"]
+   print("Played %d games in %.2f seconds, mean score %.1f (min %d, max %d), results written to %s" % (
+      summary["games"], summary["batch_seconds"], summary["score"]["mean"], summary["score"]["min"],
+      summary["score"]["max"], args.output))
+
+if __name__ == "__main__":
+   main()
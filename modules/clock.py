@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# add the current directory to the system path
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import time # used for getting the current time
+
+# Class used for measuring the time of a game and the delays of its moves in milliseconds. Every game has its own
+# clock, so the delays of a game (e.g. the drop speed, the key delays) never affect the other games. This clock
+# follows the real time, a VirtualClock can be used for the games that are simulated faster than the real time.
+class Clock:
+   # Constructor that creates a clock without any delays
+   def __init__(self):
+      # the times that the delayed moves become available again by their names
+      self.availability = {}
+
+   # Method for getting the current time in milliseconds
+   def now(self):
+      return time.time()*1000
+
+   # Method for moving the clock forward by the given milliseconds, the real time goes forward by itself
+   def advance(self, ms):
+      pass
+
+   # Method for checking whether the given move is available, a move is available again when its delay is over
+   def is_available(self, name):
+      return self.now() >= self.availability.get(name, float("-inf"))
+
+   # Method for making the given move unavailable for the given milliseconds
+   def set_delay(self, name, delay):
+      self.availability[name] = self.now() + delay
+
+# Class used for a clock that only goes forward when it is advanced, so a game can be played without waiting for
+# its delays (e.g. in the simulations and the replays)
+class VirtualClock(Clock):
+   # Constructor that creates a clock starting from the given time in milliseconds
+   def __init__(self, start=0):
+      Clock.__init__(self)
+      self.time = start
+      # the milliseconds that the clock went forward by the last time it is advanced
+      self.last_advance = 0
+
+   # Method for getting the current time in milliseconds
+   def now(self):
+      return self.time
+
+   # Method for moving the clock forward by the given milliseconds
+   def advance(self, ms):
+      self.time += ms
+      self.last_advance = ms
+
+   # Method for making the given move unavailable for the given milliseconds. The delay starts from the time that
+   # the move became available if it became available during the last advance, so the delays that are not
+   # multiples of the advances (e.g. 125 ms with 10 ms steps) keep their length on average.
+   def set_delay(self, name, delay):
+      available = self.availability.get(name, float("-inf"))
+      start = available if self.time - self.last_advance < available <= self.time else self.time
+      self.availability[name] = start + delay
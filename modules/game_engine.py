@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# add the current directory to the system path
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import numpy as np # fundamental Python module for scientific computing
+from game_grid import GameGrid # class for modeling the game grid
+from tetromino import ORIENTATIONS # the orientations of the tetrominoes
+from piece_generator import PieceGenerator # class for creating the tetrominoes from a seeded random number generator
+from clock import VirtualClock # class for measuring the time of a simulated game
+
+# the actions that can be given to the engine in every step
+ACTIONS = ("none", "left", "right", "rotate", "soft_drop", "hard_drop", "gravity")
+
+# the milliseconds between the standart drops of the tetrominoes by difficulty (easy, normal, hard, extreme)
+DROP_SPEEDS = (350, 250, 125, 75)
+
+# the milliseconds of a simulated frame, one action is taken in every frame (same as the soft drop delay of the game)
+FRAME_MS = 50
+
+# Class used for running the rules of a game without drawing anything. Every step applies one action
+# instantly, the timing of the actions (gravity, key delays) is up to the caller.
+class GameEngine:
+   # Constructor that creates a game with the given grid size, game mode and difficulty. The generator of the
+   # tetrominoes can be given, a generator with a random seed is used otherwise. The clock of the game can be
+   # given too, a virtual clock that goes forward with the simulated frames is used otherwise.
+   def __init__(self, grid_h, grid_w, gamemode, difficulty, generator=None, clock=None):
+      # set the dimensions, game mode and difficulty of the game
+      self.grid_height = grid_h
+      self.grid_width = grid_w
+      self.gamemode = gamemode
+      self.difficulty = difficulty
+      # set the generator used for creating the tetrominoes
+      if generator is None:
+         generator = PieceGenerator(grid_h, grid_w, gamemode)
+      # the next three tetrominoes are shown on the game grid
+      if generator.preview_length < 3:
+         raise ValueError("The preview of the generator must have at least 3 tetrominoes")
+      self.generator = generator
+      # set the clock used for the delays of the moves
+      self.clock = clock if clock is not None else VirtualClock()
+      # create the game grid and the tetrominoes
+      self.reset()
+
+   # Method for starting a new game, the generator of the tetrominoes starts over if a seed is given
+   def reset(self, seed=None):
+      if seed is not None:
+         self.generator.reset(seed)
+      # create the game grid
+      self.grid = GameGrid(self.grid_height, self.grid_width, self.gamemode, self.difficulty, self.clock)
+      # the number of the simulated frames played, and the milliseconds that passed since the last drop by gravity
+      self.frames = 0
+      self.gravity_time = 0
+      # the depth of the cascade of merges and line clears caused by the last placed tetromino (the number of
+      # the merge passes and the line clears in the chain)
+      self.last_chain = 0
+      # the cell values of the three upcoming tetrominoes in their tile matrices as 4x4 matrices, the first row
+      # is the bottom row of a tile matrix (the array is updated in place with every new tetromino)
+      self.upcoming = np.zeros((3, 4, 4), dtype=np.uint8)
+      # get the current tetromino
+      self.current_tetromino = self.generator.next()
+      self.update_tetrominoes()
+
+   # Method for setting the current and the upcoming tetrominoes on the game grid
+   def update_tetrominoes(self):
+      upcoming = self.generator.preview()
+      self.grid.current_tetromino = self.current_tetromino
+      self.grid.next_tetromino1 = upcoming[0]
+      self.grid.next_tetromino2 = upcoming[1]
+      self.grid.next_tetromino3 = upcoming[2]
+      # update the matrices of the upcoming tetrominoes
+      self.upcoming[:] = 0
+      for i in range(3):
+         tetromino = upcoming[i]
+         for ((x, y), value) in zip(ORIENTATIONS[tetromino.type][tetromino.orientation].cells, tetromino.values):
+            self.upcoming[i, y, x] = value
+
+   # Method for applying the given action to the current tetromino, returns the events of the game grid
+   # that happened during the step
+   def step(self, action):
+      grid = self.grid
+      tetromino = self.current_tetromino
+      # do nothing if the game is over already
+      if grid.game_over:
+         return grid.collect_events()
+      # move the tetromino left or right by one cell
+      if action == "left" or action == "right":
+         tetromino.move(action, grid, 1)
+      # rotate the tetromino
+      elif action == "rotate":
+         tetromino.rotate(grid)
+      # move the tetromino down by one cell and increase the score by 1 if it can go down
+      elif action == "soft_drop":
+         if tetromino.move("down", grid, 1):
+            grid.score += 1
+      # move the tetromino all the way down, increase the score by line count * 2 and place it
+      elif action == "hard_drop":
+         count = tetromino.drop(grid)
+         grid.score += count * 2
+         self.lock()
+      # move the tetromino down by one cell, place it if it cannot go down anymore
+      elif action == "gravity":
+         if not tetromino.move("down", grid, 1):
+            self.lock()
+      # return the events of the step
+      return grid.collect_events()
+
+   # Method for playing one simulated frame of FRAME_MS milliseconds, the given action is applied and then the
+   # tetromino goes down by gravity at the drop speed of the difficulty. Returns the events of the frame.
+   def frame(self, action):
+      tetromino = self.current_tetromino
+      events = self.step(action)
+      self.frames += 1
+      self.clock.advance(FRAME_MS)
+      # the gravity is applied whenever the drop speed of the difficulty has passed since the last drop, the rest of
+      # the milliseconds are carried over to the next drop since the drop speeds are not multiples of FRAME_MS
+      speed = DROP_SPEEDS[self.difficulty]
+      self.gravity_time += FRAME_MS
+      if self.gravity_time >= speed:
+         if self.current_tetromino is tetromino:
+            self.gravity_time -= speed
+            events += self.step("gravity")
+         # the drop is done in the next frame if the tetromino is placed by the action, as in the game
+         else:
+            self.gravity_time = speed - FRAME_MS
+      return events
+
+   # Method for placing the current tetromino on the game grid, resolving the merges and line clears,
+   # and getting the next tetromino
+   def lock(self):
+      grid = self.grid
+      self.last_chain = 0
+      # update the game grid by adding the tiles of the tetromino, the tiles are on the grid from now on
+      grid.update_grid(self.current_tetromino)
+      grid.current_tetromino = None
+      # stop if the game is over
+      if grid.game_over:
+         return
+
+      # do chain merging and line clearing until it cannot if the game mode is 2048
+      if self.gamemode == "2048":
+         while True:
+            self.last_chain += grid.check_line_chain_merge()
+            score_before_line_delete = grid.score
+            grid.delete_full_lines()
+            if score_before_line_delete == grid.score:
+               break
+            self.last_chain += 1
+      # check the lines only if the game mode is tetris
+      else:
+         score_before_line_delete = grid.score
+         grid.delete_full_lines()
+         if score_before_line_delete != grid.score:
+            self.last_chain = 1
+
+      # get the next tetromino and set the current tetromino and the next tetrominoes
+      self.current_tetromino = self.generator.next()
+      self.update_tetrominoes()
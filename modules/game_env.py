@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# add the current directory to the system path
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+from game_engine import GameEngine, ACTIONS # class for running the rules of a game and the actions it takes
+from piece_generator import PieceGenerator # class for creating the tetrominoes from a seed
+
+# Class used for playing the game as an environment with a reset/step interface (as in Gym). Every step plays one
+# simulated frame of the game with the given action, and the reward is the change of the score. The observation
+# is a dictionary of the cell matrix of the game grid ("board") and the 4x4 cell matrices of the three upcoming
+# tetrominoes ("next"), both are read-only views of the arrays of the game that are updated in place.
+class GameEnv:
+   # Constructor that creates an environment with the given game mode, difficulty, grid size and the way the
+   # tetromino types are chosen ("uniform" or "bag")
+   def __init__(self, gamemode="2048", difficulty=1, grid_h=20, grid_w=12, randomizer="uniform"):
+      self.gamemode = gamemode
+      self.difficulty = difficulty
+      self.grid_height = grid_h
+      self.grid_width = grid_w
+      # the actions that can be taken, the actions can be given by their names or their indexes
+      self.actions = ACTIONS
+      generator = PieceGenerator(grid_h, grid_w, gamemode, randomizer=randomizer)
+      self.engine = GameEngine(grid_h, grid_w, gamemode, difficulty, generator)
+      self.renderer = None
+      # the observation of the current game, a game is started by reset()
+      self.observation = None
+
+   # Method for starting a new game, the tetrominoes are seeded with the given seed. Returns the first observation.
+   def reset(self, seed=None):
+      self.engine.reset(seed)
+      # the renderer draws the previous game grid
+      self.renderer = None
+      grid = self.engine.grid
+      # create the read-only views of the observation once, they show the current state after every step
+      board = grid.cells.view()
+      board.flags.writeable = False
+      upcoming = self.engine.upcoming.view()
+      upcoming.flags.writeable = False
+      self.observation = {"board": board, "next": upcoming}
+      return self.observation
+
+   # Method for taking the given action, returns the observation, the reward, whether the game is over and a
+   # dictionary of extra information (the score and the events of the step)
+   def step(self, action):
+      if self.observation is None:
+         raise RuntimeError("reset() must be called before step()")
+      if not isinstance(action, str):
+         action = self.actions[action]
+      grid = self.engine.grid
+      score = grid.score
+      events = self.engine.frame(action)
+      info = {"score": grid.score, "events": events}
+      return self.observation, grid.score - score, grid.game_over, info
+
+   # Method for drawing the game on the canvas of the stddraw module
+   def render(self):
+      # the renderer is only imported when it is needed so that the environment can be used without a display
+      if self.renderer is None:
+         import stddraw
+         from grid_renderer import GridRenderer
+         # set up the canvas as in the game if it is the first time
+         if not stddraw._windowCreated:
+            stddraw.setCanvasSize(35 * self.grid_width + 140, 35 * self.grid_height + 1)
+            stddraw.setXscale(-1, self.grid_width + 4)
+            stddraw.setYscale(-1, self.grid_height)
+         self.renderer = GridRenderer(self.engine.grid)
+         # the events are collected by the engine instead of being animated by the renderer
+         self.engine.grid.listener = None
+      self.renderer.display()
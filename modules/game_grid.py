@@ -7,28 +7,41 @@ import os
 # add the current directory to the system path
 sys.path.append(os.path.dirname(os.path.realpath(__file__)))
 
-import stddraw # the stddraw module is used as a basic graphics library
-from color import Color # used for coloring the game grid
 import numpy as np # fundamental Python module for scientific computing
+from clock import Clock # class for measuring the time of the game
 
-# Class used for modelling the game grid
+# Class used for modelling the game grid. The game grid only holds the rules of the game and never draws
+# anything, the events of the grid (line clears, merges, falling tiles) are reported to the listener instead
 class GameGrid:
-	# Constructor for creating the game grid based on the given arguments
-   def __init__(self, grid_h, grid_w, gamemode, difficulty):
+	# Constructor for creating the game grid based on the given arguments, the delays of the moves on the grid are
+   # measured with the given clock (a real-time clock if it is not given)
+   def __init__(self, grid_h, grid_w, gamemode, difficulty, clock=None):
       # set the dimensions of the game grid as the given arguments
       self.grid_height = grid_h
       self.grid_width = grid_w
       # set the game mode and difficulty
       self.gamemode = gamemode
       self.difficulty = difficulty
+      # set the clock of the game
+      self.clock = clock if clock is not None else Clock()
       # set the old high score
       self.old_high_score = None
-      # create the tile matrix to store the tiles placed on the game grid
-      self.tile_matrix = np.full((grid_h, grid_w), None)
+      # create the cell matrix to store the values of the tiles placed on the game grid, 0 means the cell is empty.
+      # the value is the exponent of the number on the tile in 2048 mode (e.g. 3 for 8), and the index of the type
+      # of the tetromino that the tile belongs to (starting from 1) in classic tetris mode
+      self.cells = np.zeros((grid_h, grid_w), dtype=np.uint8)
+      # create the occupancy masks of the rows, the bit of a column is set if the cell is occupied by a tile
+      self.row_masks = [0] * grid_h
+      # create the surface heights of the columns, the height of a column is one more than the row of its
+      # topmost tile (0 if the column is empty)
+      self.heights = [0] * grid_w
+      # the mask of a row that is all occupied
+      self.full_mask = (1 << grid_w) - 1
+      # the columns that are changed by a placement, a fall or a line clear since their merges were checked,
+      # the other columns never have tiles with the same number on top of each other (2048 mode only)
+      self.dirty_columns = set()
       # the tetromino that is currently being moved on the game grid
       self.current_tetromino = None
-      # the tetromino that is currently ghost
-      self.current_ghost = None
       # game_over flag shows whether the game is over/completed or not
       self.game_over = False
       # set the initial score
@@ -39,154 +52,27 @@ class GameGrid:
       self.next_tetromino1 = None
       self.next_tetromino2 = None
       self.next_tetromino3 = None
-
-      # if the game mode is classic tetris
-      if gamemode == "tetris":
-         # set the color used for the empty grid cells
-         self.empty_cell_color = Color(0, 0, 0)
-         self.background_color = Color(0, 0, 0)
-         # set the colors used for the grid lines and the grid boundaries
-         self.line_color = Color(30, 30, 30) 
-         self.boundary_color = Color(30, 30, 30)
-      # if the game mode is tetris 2048
-      else:
-         self.background_color = Color(255,251,239)
-         # set the color used for the empty grid cells
-         self.empty_cell_color = Color(214,205,196)
-         # set the colors used for the grid lines and the grid boundaries
-         self.line_color = Color(188,174,161) 
-         self.boundary_color = Color(158,138,120)
-         self.reached_2048 = False
-      # thickness values used for the grid lines and the grid boundaries 
-      self.line_thickness = 0.002
-      self.box_thickness = 8 * self.line_thickness
-
-   # Method used for displaying the game grid
-   def display(self, delay=0):
-      # clear the background canvas to empty_cell_color
-      stddraw.clear(self.background_color)
-      # draw a box around the game grid 
-      self.draw_boundaries()
-      # draw the game grid
-      self.draw_grid()
-      # draw the current (active) tetromino ghost
-      if self.current_ghost != None:
-         self.current_ghost.draw()
-      
-      # draw the current (active) tetromino
-      if self.current_tetromino != None:
-         self.current_tetromino.draw()
-      
-      # draw the normal game cycle GUI
-      if not self.game_over:
-         # set pen color based on game mode
-         if self.gamemode == "tetris":
-            stddraw.setPenColor(stddraw.WHITE)
-         else:
-            stddraw.setPenColor(self.boundary_color)
-
-         # set font and its size
-         stddraw.setFontFamily("Arial")
-         stddraw.setFontSize(24)
-
-         # draw score
-         if self.gamemode == "2048" and self.reached_2048:
-            stddraw.boldText(13.75, 19, "Congrats!")
-            stddraw.text(13.75, 17.75, "Score")
-            stddraw.boldText(13.75, 16.75, str(self.score))
-         else:
-            stddraw.text(13.75, 19, "Score")
-            stddraw.boldText(13.75, 18, str(self.score))
-
-         # draw upcoming tetrominoes
-         stddraw.text(13.75, 15, "Upcoming")
-         stddraw.text(13.75, 14, "Tetrominoes")
-         stddraw.setPenColor(self.boundary_color)
-         stddraw.filledRectangle(12,-0.25,3.5,13.5)
-         stddraw.setPenRadius(0.001)
-         if self.gamemode == "tetris":
-            stddraw.setPenColor(stddraw.DARK_GRAY)
-         else:
-            stddraw.setPenColor(self.empty_cell_color)
-         stddraw.line(12.25, 8.75, 15.25, 8.75)
-         stddraw.line(12.25, 4.25, 15.25, 4.25)
-         self.next_tetromino1.copy(blcx=(14.25 - (self.next_tetromino1.column_count/2)),blcy=9.5 + (4-self.next_tetromino1.row_count)/2,trim=True).draw()
-         self.next_tetromino2.copy(blcx=(14.25 - (self.next_tetromino2.column_count/2)),blcy=5 + (4-self.next_tetromino2.row_count)/2,trim=True).draw()
-         self.next_tetromino3.copy(blcx=(14.25 - (self.next_tetromino3.column_count/2)),blcy=0.5 + (4-self.next_tetromino3.row_count)/2,trim=True).draw()
-
-         # show the canvas
-         stddraw.show(delay)
-      # draw the game over GUI
+      # set the field that holds if a 2048 tile is reached (2048 mode only)
+      self.reached_2048 = False
+      # the function that is called with every event of the game grid (set by the renderer, None when headless)
+      self.listener = None
+      # the events that happened since the last time they were collected (used when there is no listener)
+      self.events = []
+
+   # Method for reporting an event of the game grid, the event is passed to the listener if there is one,
+   # otherwise, it is stored until the events are collected
+   def emit(self, kind, data=None):
+      event = (kind, data)
+      if self.listener is not None:
+         self.listener(event)
       else:
-         # set pen color based on game mode
-         if self.gamemode == "tetris":
-            stddraw.setPenColor(stddraw.WHITE)
-         else:
-            stddraw.setPenColor(self.boundary_color)
-         
-         # set font and its size
-         stddraw.setFontFamily("Arial")
-         stddraw.setFontSize(24)
+         self.events.append(event)
 
-         # draw game over text and and final score
-         stddraw.text(13.75, 12, "Game Over!")
-         stddraw.text(13.75, 10, "Final Score:")
-         stddraw.boldText(13.75, 9, str(self.score))
-
-         # draw the high score conclusion
-         stddraw.setFontSize(18)
-         if self.score > self.old_high_score:
-            stddraw.text(13.75, 7.75, "New High Score!")
-            self.new_high_score = self.score
-         else:
-            stddraw.text(13.75, 7.75, "High Score:")
-            stddraw.boldText(13.75, 7, str(self.old_high_score))
-
-         # draw the after-game controls
-         stddraw.setFontSize(16)
-         stddraw.text(13.75,2,"Press R to")
-         stddraw.text(13.75,1.5,"restart the game,")
-         stddraw.text(13.75,1,"or press Enter to")
-         stddraw.text(13.75,0.5,"return to the")
-         stddraw.text(13.75,0,"main manu.")
-
-         # show the canvas
-         stddraw.show(delay)
-         
-   # Method for drawing the cells and the lines of the grid
-   def draw_grid(self): 
-      # draw the inner lines of the grid
-      stddraw.setPenColor(self.line_color)
-      stddraw.setPenRadius(self.line_thickness)
-      # x and y ranges for the game grid
-      start_x, end_x = -0.5, self.grid_width - 0.5
-      start_y, end_y = -0.5, self.grid_height - 0.5
-      for x in np.arange(start_x + 1, end_x, 1):  # vertical inner lines
-         stddraw.line(x, start_y, x, end_y)
-      for y in np.arange(start_y + 1, end_y, 1):  # horizontal inner lines
-         stddraw.line(start_x, y, end_x, y)
-      # draw each cell of the game grid
-      for row in range(self.grid_height):
-         for col in range(self.grid_width):
-            # draw the tile if the grid cell is occupied by a tile
-            if self.tile_matrix[row][col] != None:
-               self.tile_matrix[row][col].draw()
-      stddraw.setPenRadius()  # reset the pen radius to its default value            
-      
-   # Method for drawing the boundaries around the game grid 
-   def draw_boundaries(self):
-      # draw a bounding box around the game grid as a rectangle
-      stddraw.setPenColor(self.boundary_color)  # using boundary_color
-      # set the pen radius as box_thickness (half of this thickness is visible 
-      # for the bounding box as its lines lie on the boundaries of the canvas)
-      #stddraw.setPenRadius(self.box_thickness)
-      # coordinates of the bottom left corner of the game grid
-      pos_x, pos_y = -0.75, -0.75
-      stddraw.filledRectangle(pos_x, pos_y, self.grid_width+0.50, self.grid_height+0.50)
-      stddraw.setPenColor(self.empty_cell_color)
-      pos_x, pos_y = -0.5, -0.5
-      stddraw.filledRectangle(pos_x, pos_y, self.grid_width, self.grid_height)
-      stddraw.setPenRadius()  # reset the pen radius to its default value
+   # Method for getting the events that happened since the last call and clearing them
+   def collect_events(self):
+      events = self.events
+      self.events = []
+      return events
 
    # Method used for checking whether the grid cell with given row and column 
    # indexes is occupied by a tile or empty
@@ -194,8 +80,8 @@ class GameGrid:
       # return False if the cell is out of the grid
       if not self.is_inside(row, col):
          return False
-      # the cell is occupied by a tile if it is not None
-      return self.tile_matrix[row][col] != None
+      # the cell is occupied by a tile if its bit is set in the mask of the row
+      return (self.row_masks[row] >> col) & 1 == 1
       
    # Method used for checking whether the cell with given row and column indexes 
    # is inside the game grid or not
@@ -208,333 +94,225 @@ class GameGrid:
 
    # Method for checking line for having an empty cell
    def has_line_empty_cell(self, line):
-      # If line has None, that means it has an empty cell
-      if None in self.tile_matrix[line]:
-         return True
-      else:
-         False
+      # If the mask of the line is not full, that means it has an empty cell
+      return self.row_masks[line] != self.full_mask
+
+   # Method for checking whether a shape can be placed with its bottom left corner on the given column (x) and
+   # row (y). The shape is a list of (row offset, row mask) pairs, and the cells above the grid are free.
+   def can_place(self, shape, x, y):
+      for (dy, mask) in shape:
+         # shift the mask of the shape row to the column, the shape cannot go beyond the left limit of the grid
+         if x >= 0:
+            mask = mask << x
+         elif mask & ((1 << -x) - 1):
+            return False
+         else:
+            mask = mask >> -x
+         # the shape cannot go beyond the right limit or below the grid
+         if mask & ~self.full_mask or y + dy < 0:
+            return False
+         # the shape cannot overlap with the occupied cells of the grid
+         if y + dy < self.grid_height and self.row_masks[y + dy] & mask:
+            return False
+      return True
+
+   # Method for getting how many rows down a shape with its bottom left corner on the given column (x) and row (y)
+   # can go until it reaches a tile or the bottom of the grid. The bottom profile of the shape is a (column offset,
+   # row offset) pair for the bottommost cell of every column of the shape.
+   def drop_distance(self, shape, bottom, x, y):
+      # if the shape is above the surface of the grid, it goes down until one of its columns reaches the surface
+      distances = [y + dy - self.heights[x + dx] for (dx, dy) in bottom]
+      if min(distances) >= 0:
+         return min(distances)
+      # otherwise (e.g. the shape is under an overhang), move it down row by row
+      distance = 0
+      while self.can_place(shape, x, y - distance - 1):
+         distance += 1
+      return distance
+
+   # Method for updating the surface heights of the given columns
+   def update_heights(self, columns):
+      for col in columns:
+         occupied = np.flatnonzero(self.cells[:, col])
+         self.heights[col] = int(occupied[-1]) + 1 if len(occupied) != 0 else 0
 
    # Method for deleting the lines that is all occupied
-   def delete_full_lines(self, clear):
-      paint_indexes = []
-      indexes = []
-      # check every line for having an empty cell
-      for i in range(self.grid_height):
-         # if that line do not have any empty cells
-         if not self.has_line_empty_cell(i):
-            # add the line index to the lines to be painted
-            paint_indexes.append(i)
-            # add the line index - length of all indexes before to delete the line by its updated index
-            indexes.append(i - len(indexes))
+   def delete_full_lines(self):
+      # check every line for having an empty cell, the lines that do not have any empty cells are full
+      full = np.array([not self.has_line_empty_cell(i) for i in range(self.grid_height)])
+      paint_indexes = np.flatnonzero(full).tolist()
 
       # if there is full lines, begin deleting
-      if len(indexes) != 0:
-         # play the effect
-         clear.play()
-         
+      if len(paint_indexes) != 0:
          # if the game mode is classic tetris
          if self.gamemode == "tetris":
             # update the score
-            self.score += (1200 if len(indexes) == 4 else (300 if len(indexes) == 3 else (100 if len(indexes) == 2 else 40))) * (self.difficulty+1)
-
-            # update the color of every tile in the line to go from white to black
-            for color in reversed(range(0, 256, 4)):
-               for l in paint_indexes:
-                  for k in range(self.grid_width):
-                     self.tile_matrix[l][k].background_color = Color(color, color, color)
-                     self.tile_matrix[l][k].boundary_color = Color(color, color, color)
-                     self.tile_matrix[l][k].foreground_color = Color(color, color, color)
-               self.display()
+            self.score += (1200 if len(paint_indexes) == 4 else (300 if len(paint_indexes) == 3 else (100 if len(paint_indexes) == 2 else 40))) * (self.difficulty+1)
          # if the game mode is tetris 2048
          else:
-            # update the color of every tile in the line to white and get the number on every tile to set score
-            for l in paint_indexes:
-               line_score = 0
-               for k in range(self.grid_width):
-                  line_score += self.tile_matrix[l][k].number
-                  self.tile_matrix[l][k].background_color = Color(255,255,255)
-                  self.tile_matrix[l][k].boundary_color = Color(255,255,255)
-                  self.tile_matrix[l][k].foreground_color = Color(255,255,255)
-               self.score += (line_score * (self.difficulty + 1))
-            self.display()
-            
-            # update the color of every tile in the line to go from white to the background color
-            for color in reversed(range(215, 256, 5)):
-               for l in paint_indexes:
-                  for k in range(self.grid_width):
-                     self.tile_matrix[l][k].background_color = Color(color, color-10, color-20)
-                     self.tile_matrix[l][k].boundary_color = Color(color, color-10, color-20)
-                     self.tile_matrix[l][k].foreground_color = Color(color, color-10, color-20)
-               self.display()
-            
-            # make the color of every tile None
-            for l in paint_indexes:
-                  for k in range(self.grid_width):
-                     self.tile_matrix[l][k].background_color = None
-
-         # delete the full lines and add new empty lines on the top of the grid
-         for r in indexes:
-            self.tile_matrix = np.delete(self.tile_matrix, (r), axis=0)
-            self.tile_matrix = np.append(self.tile_matrix, np.full((1, self.grid_width), None), axis=0)
-            
-            # move every tile above the deleted line down
-            for i in range(r, self.grid_height):
-               for j in range(self.grid_width):
-                  if self.tile_matrix[i][j] != None:
-                     self.tile_matrix[i][j].move(0, -1)
+            # get the sum of the numbers on every tile in the lines to set score
+            line_score = int(np.left_shift(1, self.cells[paint_indexes].astype(np.int64)).sum())
+            self.score += (line_score * (self.difficulty + 1))
+
+         # report the lines to be cleared while they are still on the grid
+         self.emit("clear", paint_indexes)
+
+         # delete all the full lines at once by moving the remaining lines down in their order
+         # and add new empty lines on the top of the grid (the cell matrix is changed in place)
+         kept = self.cells[~full]
+         self.cells[:len(kept)] = kept
+         self.cells[len(kept):] = 0
+         self.row_masks = [mask for (mask, is_full) in zip(self.row_masks, full) if not is_full]
+         self.row_masks += [0] * len(paint_indexes)
+         # every column is changed after the lines are deleted
+         self.dirty_columns.update(range(self.grid_width))
+         self.update_heights(range(self.grid_width))
 
    # Method for merging the tiles that have the same number and on top of each other, after every merging,
-   # it also move down the floating tiles and check the tiles again to make the chain merge happen
-   def check_line_chain_merge(self, merge):
-      # copy the matrix and rotate it 90 degrees
-      matrix = self.tile_matrix.copy()
-      rotated = np.rot90(matrix)
-
-      # loop through every tile until there is no merging to happen
+   # it also move down the floating tiles and check the tiles again to make the chain merge happen. Only the
+   # columns that are changed since the last check are checked. Returns the number of the passes that merged
+   # tiles (the depth of the chain merge).
+   def check_line_chain_merge(self):
+      depth = 0
+      # loop until there is no merging to happen
       while True:
-         # for every line on the rotated matrix
-         for i in range(len(rotated)):
-            # check the line until there is no merging to happen
-            while True:
-               # set an indicator
-               have_dupes = False
-
-               # check every tile
-               for j in range(len(rotated[i]) - 1):
-                  # if there are tiles on top of each other
-                  if rotated[i][j] != None and rotated[i][j+1] != None:
-                     # if the tiles have same number on them
-                     if rotated[i][j].number == rotated[i][j+1].number:
-                        # play the effect
-                        merge.play()
-
-                        # update the color of tiles to white
-                        rotated[i][j].background_color = Color(255,255,255)
-                        rotated[i][j].boundary_color = Color(255,255,255)
-                        rotated[i][j].foreground_color = Color(255,255,255)
-                        rotated[i][j+1].background_color = Color(255,255,255)
-                        rotated[i][j+1].boundary_color = Color(255,255,255)
-                        rotated[i][j+1].foreground_color = Color(255,255,255)
-                        self.tile_matrix = np.rot90(rotated, -1)
-                        self.display()
-                        
-                        # update the color of tiles from white to the background color
-                        for color in reversed(range(215, 256, 5)):
-                           rotated[i][j].background_color = Color(color, color-10, color-20)
-                           rotated[i][j].boundary_color = Color(color, color-10, color-20)
-                           rotated[i][j].foreground_color = Color(color, color-10, color-20)
-                           rotated[i][j+1].background_color = Color(color, color-10, color-20)
-                           rotated[i][j+1].boundary_color = Color(color, color-10, color-20)
-                           rotated[i][j+1].foreground_color = Color(color, color-10, color-20)
-                           self.tile_matrix = np.rot90(rotated, -1)
-                           self.display()
-
-                        # make the upper tile invisible
-                        rotated[i][j+1].background_color = None
-                        rotated[i][j+1].boundary_color = None
-                        rotated[i][j+1].foreground_color = None
-
-                        # set the have duplicate tiles indicator to true to malke to loop run again
-                        have_dupes = True
-
-                        # change the number of bottom tile and add the number to the score
-                        rotated[i][j].change_number(rotated[i][j].number*2)
-                        self.score += rotated[i][j].number * (self.difficulty+1)
-
-                        # if the number is 2048, set the related field to true
-                        if rotated[i][j].number == 2048:
-                           self.reached_2048 = True
-                        
-                        # delete the upper tile
-                        rotated[i][j+1] = None
-
-                        # update the tile matrix
-                        self.tile_matrix = np.rot90(rotated, -1)
-                        self.display()
-                        break
-               # if there are no duplicate tiles, go to the next line
-               if not have_dupes:
-                  break
-         # check if there are floating tiles and move them down
+         # merge the tiles of every changed column
+         columns = sorted(self.dirty_columns)
+         self.dirty_columns = set()
+         score_before_merge = self.score
+         for col in columns:
+            self.merge_column(col)
+         if self.score != score_before_merge:
+            depth += 1
+         # check if there are floating tiles and move them down, the columns of the tiles that fell are
+         # changed and checked again
          have_floating = self.move_floating_tiles()
 
-         # if there are no floating tiles, break the loop, otherwise, check the matrix again
+         # if there are no floating tiles, break the loop
          if not have_floating:
             break
+      return depth
+
+   # Method for merging all the tiles that have the same number and on top of each other in the given column
+   # in one pass from the bottom to the top. The bottommost pair is merged first, and a merged tile is merged
+   # again with the tile below it if they have the same number.
+   def merge_column(self, col):
+      values = self.cells[:, col].tolist()
+      # the rows of the tiles on top of each other below the current row (the current stack of the column)
+      stack = []
+      for row in range(self.grid_height):
+         # an empty cell ends the stack
+         if values[row] == 0:
+            stack = []
+         # merge the tile with the tile below it if they have the same number
+         elif len(stack) != 0 and values[stack[-1]] == values[row]:
+            stack.append(row)
+            while len(stack) > 1 and values[stack[-2]] == values[stack[-1]]:
+               upper = stack.pop()
+               lower = stack[-1]
+               # double the number of the bottom tile and delete the upper tile
+               values[lower] += 1
+               values[upper] = 0
+               self.cells[lower][col] = values[lower]
+               self.cells[upper][col] = 0
+               self.row_masks[upper] &= ~(1 << col)
+               # add the new number to the score
+               self.score += (1 << values[lower]) * (self.difficulty+1)
+               # if the number is 2048, set the related field to true
+               if values[lower] == 11:
+                  self.reached_2048 = True
+               # report the merged tiles by the position of the bottom one
+               self.emit("merge", (lower, col))
+            # the deleted tile ends the stack
+            stack = []
+            # the topmost tile of the column may be deleted
+            self.update_heights([col])
+         else:
+            stack.append(row)
 
-      # clear user interactions
-      stddraw.clearKeysTyped()
-      stddraw.clearMousePresses()
-
-   # Method for moving the tiles that are not connected to the bottom of the game grid
+   # Method for moving the tiles that are not connected to the bottom of the game grid. Every floating tile
+   # falls until it reaches a tile or the bottom, the final rows are computed in one pass over each column
+   # and all the drops are reported at once as a (row, new row, column) list
    def move_floating_tiles(self):
-      # binarize the tile matrix
-      arr = self.binarize_tile_matrix()
-
-      # label the binarized array by the 4-connected labeling method
-      array, label_count = self.label_array(arr)
-
-      # delete the excess columns and lines that are added to make the labeling happen
-      first_line_removed = np.delete(array, 0, axis=0)
-      base_line_removed = np.delete(first_line_removed, 0, axis=0)
-      last_line_removed = np.delete(base_line_removed, base_line_removed.shape[0]-1, axis=0)
-      first_column_removed = np.delete(last_line_removed, 0, axis=1)
-      trimmed = np.delete(first_column_removed, first_column_removed.shape[1]-1, axis=1)
-
-      # get the shape of the labeled and trimmed array
-      (nrows, ncols) = trimmed.shape
-
-      # move down every tile that has a different label from the bottomest tiles' label
-      for i in range(nrows):
-         for j in range(ncols):
-            if trimmed[i][j] != 1 and trimmed[i][j] != 0:
-               self.move_tile_down(i, j)
+      # get the tiles that are connected to the bottom of the game grid
+      connected = self.connected_masks()
+
+      drops = []
+      have_floating = False
+      for j in range(self.grid_width):
+         bit = 1 << j
+         # the lowest empty row that a floating tile in the column can fall to
+         lowest = 0
+         # go over the tiles of the column starting from the bottommost one
+         for i in range(self.grid_height):
+            if not self.row_masks[i] & bit:
+               continue
+            # the tiles that are connected to the bottom stay where they are
+            if connected[i] & bit:
+               lowest = i + 1
+               continue
+            have_floating = True
+            # move the floating tile down to the lowest empty row
+            if lowest != i:
+               self.cells[lowest][j] = self.cells[i][j]
+               self.cells[i][j] = 0
+               self.row_masks[i] &= ~bit
+               self.row_masks[lowest] |= bit
+               drops.append((i, lowest, j))
+               self.dirty_columns.add(j)
+            lowest += 1
+
+      # report the tiles that fell
+      self.update_heights(set(j for (i, lowest, j) in drops))
+      if len(drops) != 0:
+         self.emit("fall", drops)
 
       # return true if there are tiles that are not connected to the bottom
-      return True if label_count > 1 else False
+      return have_floating
+
+   # Method for getting the row masks of the tiles that are 4-connected to the bottom of the game grid. The masks
+   # are found by a flood fill on the occupancy masks of the rows starting from the tiles on the bottom row.
+   def connected_masks(self):
+      masks = self.row_masks
+      connected = [0] * self.grid_height
+      connected[0] = masks[0]
+      # the rows are swept upwards and then downwards until the fill does not change anymore
+      order = list(range(self.grid_height)) + list(range(self.grid_height - 2, -1, -1))
+      changed = True
+      while changed:
+         changed = False
+         for row in order:
+            # fill the tiles that are connected to the filled tiles of the rows below and above
+            fill = connected[row]
+            if row > 0:
+               fill |= connected[row-1] & masks[row]
+            if row < self.grid_height - 1:
+               fill |= connected[row+1] & masks[row]
+            # spread the fill to the left and right neighbors in the row
+            while True:
+               spread = (fill | (fill << 1) | (fill >> 1)) & masks[row]
+               if spread == fill:
+                  break
+               fill = spread
+            if fill != connected[row]:
+               connected[row] = fill
+               changed = True
+      return connected
    
-   # Method for dropping the tile to bottom until it reaches a tile or bottom
-   def move_tile_down(self, i, j):
-      index = 0
-      # loop until the bottom of the tile do not touch another tile or bottom
-      while True:
-         if self.tile_matrix[i-(index+1)][j] == None and i-index != 0:
-            # move down the tile
-            self.tile_matrix[i-index][j].move(0, -1)
-            self.tile_matrix[i-(index+1)][j] = self.tile_matrix[i-index][j]
-            self.tile_matrix[i-index][j] = None
-            # display the canvas each time
-            self.display(delay=50)
-            index += 1
-         else:
-            break
-               
-   # Method for updating the game grid by placing the given tiles of a stopped 
+   # Method for updating the game grid by placing the cells of a stopped 
    # tetromino and checking if the game is over due to having tiles above the 
-   # topmost game grid row. The method returns True when the game is over and
-   # False otherwise.
-   def update_grid(self, tiles_to_place):
-      # place all the tiles of the stopped tetromino onto the game grid 
-      n_rows, n_cols = len(tiles_to_place), len(tiles_to_place[0])
-      for col in range(n_cols):
-         for row in range(n_rows):            
-            # place each occupied tile onto the game grid
-            if tiles_to_place[row][col] != None:
-               pos = tiles_to_place[row][col].get_position()
-               if self.is_inside(pos.y, pos.x):
-                  self.tile_matrix[pos.y][pos.x] = tiles_to_place[row][col]
-               # the game is over if any placed tile is out of the game grid
-               else:
-                  self.game_over = True
-
-   # Method for binarizing the tile matrix
-   # The cells that are empty becomes 0 and the cells that have tiles becomes 1
-   def binarize_tile_matrix(self):
-      # get the shape of the tile matrix
-      (nrows, ncols) = self.tile_matrix.shape
-
-      # create a new array filled with zeros that has the 2 more columns and 3 more rows
-      arr = np.full((nrows+3, ncols+2), 0)
-
-      # make a base line filled with ones to understand the tiles that are connected to bottom
-      arr[1] = np.full((1,ncols+2), 1)
-      arr[1][0] = 0
-      arr[1][ncols+1] = 0
-
-      # make the non-empty cells one
-      for i in range(nrows):
-         for j in range(ncols):
-            if self.tile_matrix[i][j] != None:
-               arr[i+2][j+1] = 1
-
-      # return binarized array
-      return arr
-
-   # Method for labeling the binarized tile matrix to distinguish the tiles that are not connected to the bottom
-   # of the matrix
-   def label_array(self, binarized):
-      max_label = int(10000)
-      nrow = binarized.shape[0]
-      ncol = binarized.shape[1]
-
-      # create a new array that will hold the labels and that has the same shape with the binarized array
-      im = np.full(shape=(nrow,ncol), dtype = int, fill_value=max_label)
-
-      # create an label holder array
-      a = np.arange(0,max_label, dtype = int)
-
-      k = 0
-      # start labeling by checking connected tiles
-      for i in range(1, nrow - 1):
-         for j in range(1, ncol - 1):
-            # get the related tiles
-            c   = binarized[i][j]
-            label_u  = im[i-1][j]
-            label_l  = im[i][j-1]
-
-            # check if the tile exists
-            if c == 1:
-               # get the minimum labeled tile around the current one
-               min_label = min(label_u, label_l)
-                    
-               # if the minimum labeled tile has the maximum label value, give it a temp value
-               # else, update the array with the label
-               if min_label == max_label:  # u = l = 0
-                  k += 1
-                  im[i][j] = k
-               else:
-                  im[i][j] = min_label
-                  if min_label != label_u and label_u != max_label:
-                     self.update_labeled_array(a, min_label, label_u)
-
-                  if min_label != label_l and label_l != max_label:
-                     self.update_labeled_array(a, min_label, label_l)
-
-
-      # initialize an array for labels
-      labels = []
-
-      # final reduction in the label array, also add the labels into the label list
-      for i in range(k+1):
-         index = i
-         while a[index] != index:
-            index = a[index]
-         a[i] = a[index]
-         labels.append(a[i])
-
-      # Removes duplicates drom the list
-      labels = list(dict.fromkeys(labels))
-      labels.pop(0)
-   
-      # second pass to resolve labels
-      for i in range(nrow):
-         for j in range(ncol):
-            if binarized[i][j] == 1 and im[i][j] != max_label:
-                im[i][j] = a[im[i][j]]
-            else:
-                im[i][j] = 0
-
-      # return the labeled array, label list
-      return im, len(labels)
-
-   def update_labeled_array(self, a, label1, label2):
-      index = lab_small = lab_large = 0
-      if label1 < label2 :
-         lab_small = label1
-         lab_large = label2
-      else:
-         lab_small = label2
-         lab_large = label1
-      index = lab_large
-      while index > 1 and a[index] != lab_small:
-         if a[index] < lab_small:
-            temp = index
-            index = lab_small
-            lab_small = a[temp]
-         elif a[index] > lab_small:
-            temp = a[index]
-            a[index] = lab_small
-            index = temp
+   # topmost game grid row.
+   def update_grid(self, tetromino):
+      # place all the cells of the stopped tetromino onto the game grid 
+      for (col, row, value) in tetromino.get_cells():
+         if self.is_inside(row, col):
+            self.cells[row][col] = value
+            self.row_masks[row] |= 1 << col
+            self.dirty_columns.add(col)
+            self.heights[col] = max(self.heights[col], row + 1)
+         # the game is over if any placed tile is out of the game grid
          else:
-            break
-      
\ No newline at end of file
+            self.game_over = True
+      # hold the score as the new high score if the game is over with a higher score
+      if self.game_over and self.old_high_score is not None and self.score > self.old_high_score:
+         self.new_high_score = self.score
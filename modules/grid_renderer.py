@@ -0,0 +1,532 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# add the current directory to the system path
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import stddraw # the stddraw module is used as a basic graphics library
+from color import Color # used for coloring the game grid
+from tile import Tile # used for creating the tiles to be drawn
+from point import Point # used for the positions of the tiles
+from tetromino import TETROMINO_TYPES # used for getting the tetromino types of the tiles
+import numpy as np # fundamental Python module for scientific computing
+import time # used for timing the animations that do not block the game
+
+# the cached background layers (the boundaries and the lines of the game grid and the side panel) by the game mode,
+# the grid size, the canvas state and whether the side panel is drawn, shared by all the renderers
+_BACKGROUNDS = {}
+
+# the highest cell value that has its own colors in the palette of the board in 2048 mode (2^31), the tiles with
+# higher numbers are drawn with its colors
+MAX_PALETTE_VALUE = 31
+
+# Class used for drawing a game grid and animating its events on the canvas
+class GridRenderer:
+   # Constructor that creates a renderer for the given game grid, the sounds are played with the related events.
+   # The ghost of the current tetromino is drawn where it would land if it is dropped when show_ghost is true.
+   def __init__(self, grid, sounds=None, show_ghost=True):
+      # set the game grid and listen to its events
+      self.grid = grid
+      self.grid.listener = self.handle_event
+      # set the sounds to be played on the events (e.g. {"clear": clear, "merge": merge})
+      self.sounds = sounds if sounds is not None else {}
+      self.show_ghost = show_ghost
+
+      # if the game mode is classic tetris
+      if grid.gamemode == "tetris":
+         # set the color used for the empty grid cells
+         self.empty_cell_color = Color(0, 0, 0)
+         self.background_color = Color(0, 0, 0)
+         # set the colors used for the grid lines and the grid boundaries
+         self.line_color = Color(30, 30, 30)
+         self.boundary_color = Color(30, 30, 30)
+      # if the game mode is tetris 2048
+      else:
+         self.background_color = Color(255,251,239)
+         # set the color used for the empty grid cells
+         self.empty_cell_color = Color(214,205,196)
+         # set the colors used for the grid lines and the grid boundaries
+         self.line_color = Color(188,174,161)
+         self.boundary_color = Color(158,138,120)
+      # thickness values used for the grid lines and the grid boundaries
+      self.line_thickness = 0.002
+      self.box_thickness = 8 * self.line_thickness
+      # the tiles that are falling as (row, new row, column) drops, the time the fall started and the time
+      # in milliseconds that a tile takes to fall by one row
+      self.falls = []
+      self.fall_start = 0
+      self.fall_delay = 50
+      # the pre-rendered images (sprites) of the tiles by (cell value, ghost) and the canvas state (size and
+      # scales) that they are rendered for, they are rendered again when the canvas state changes
+      self.sprites = {}
+      self.sprites_state = None
+      # the palette of the board image, the number of the tile colors in it, the outlines of the cells as a pixel
+      # pattern and the pre-rendered numbers of the tiles by cell value, they are set up with the sprites
+      self.palette = None
+      self.palette_size = 0
+      self.outlines = None
+      self.glyphs = {}
+      # the sprites drawn on the cells and the contents of the side panel in the last frame, and the canvas state
+      # and clear count of stddraw when the last frame is drawn fully (None if it needs to be drawn fully again)
+      self.last_cells = {}
+      self.last_panel = None
+      self.drawn_state = None
+
+   # Method that is called by the game grid with every event, plays the related sound and animation
+   def handle_event(self, event):
+      kind, data = event
+      # play the sound of the event if there is one
+      if kind in self.sounds:
+         self.sounds[kind].play()
+      # animate the event
+      if kind == "clear":
+         # the rows of the falling tiles change after the lines are deleted
+         self.falls = []
+         self.animate_clear(data)
+      elif kind == "merge":
+         self.animate_merge(data)
+      elif kind == "fall":
+         self.animate_fall(data)
+
+   # Method for animating the given full lines before they are deleted
+   def animate_clear(self, rows):
+      cells = [(row, col) for row in rows for col in range(self.grid.grid_width)]
+      # if the game mode is classic tetris
+      if self.grid.gamemode == "tetris":
+         # paint every tile in the lines to go from white to black
+         for color in reversed(range(0, 256, 4)):
+            self.display(highlight=cells, highlight_color=Color(color, color, color))
+      # if the game mode is tetris 2048
+      else:
+         # paint every tile in the lines to white
+         self.display(highlight=cells, highlight_color=Color(255,255,255))
+         # paint every tile in the lines to go from white to the background color
+         for color in reversed(range(215, 256, 5)):
+            self.display(highlight=cells, highlight_color=Color(color, color-10, color-20))
+
+   # Method for animating the merge of the tile on the given cell and the tile above it
+   def animate_merge(self, cell):
+      row, col = cell
+      cells = [(row, col), (row+1, col)]
+      # paint the tiles to white
+      self.display(highlight=cells, highlight_color=Color(255,255,255))
+      # paint the tiles to go from white to the background color
+      for color in reversed(range(215, 256, 5)):
+         self.display(highlight=cells, highlight_color=Color(color, color-10, color-20))
+      # display the merged tile
+      self.display()
+
+   # Method for starting the animation of the tiles that fell, the tiles are drawn falling from their old rows
+   # by the next displays so that the game does not wait for the animation
+   def animate_fall(self, drops):
+      positions = self.fall_positions()
+      self.falls = []
+      for (row, new_row, col) in drops:
+         # a tile that is still falling continues from where it is drawn
+         self.falls.append((positions.pop((row, col), row), new_row, col))
+      # the other tiles that are still falling continue their falls
+      for ((row, col), y) in positions.items():
+         self.falls.append((y, row, col))
+      self.fall_start = time.time()
+
+   # Method for getting the drawn rows of the falling tiles by their (row, column) on the game grid
+   def fall_positions(self):
+      # get how many rows the tiles fell since the start of the fall
+      distance = (time.time() - self.fall_start) * 1000 / self.fall_delay
+      positions = {}
+      for (row, new_row, col) in self.falls:
+         if row - distance > new_row:
+            positions[(new_row, col)] = row - distance
+      # stop the animation when all the tiles reach their rows
+      if len(positions) == 0:
+         self.falls = []
+      return positions
+
+   # Method used for displaying the game grid, the highlighted cells are painted with the highlight color. Only the
+   # cells and the side panel that are changed since the last frame are drawn again if the last frame is still on the
+   # canvas, the whole canvas is drawn again during the animations or after something else is drawn on the canvas.
+   def display(self, delay=0, highlight=None, highlight_color=None):
+      grid = self.grid
+      # render the tile sprites if the canvas is changed since they are rendered
+      self.update_sprites()
+      # get the sprites drawn on every cell and the contents of the side panel
+      cells = self.cell_sprites()
+      panel = self.panel_contents()
+      state = (stddraw.getCanvasState(), stddraw.clearCount())
+      animating = highlight is not None or len(self.fall_positions()) != 0
+      # draw only the changed parts of the last frame and show them if nothing is animated
+      if state == self.drawn_state and not animating and not grid.game_over:
+         stddraw.showRects(self.repaint(cells, panel), delay)
+         return
+      # the next frame can be drawn on this frame if nothing is animated
+      self.drawn_state = state if not animating and not grid.game_over else None
+      self.last_cells = cells
+      self.last_panel = panel
+
+      # draw the background, the box around the game grid, its lines and the side panel (if the game is not over)
+      self.draw_background(not grid.game_over)
+      # draw the tiles of the game grid, the current (active) tetromino and its ghost
+      self.draw_board()
+
+      # paint the highlighted cells
+      if highlight is not None:
+         for (row, col) in highlight:
+            self.draw_cell(col, row, highlight_color, highlight_color)
+
+      # draw the normal game cycle GUI
+      if not grid.game_over:
+         # draw the score and the upcoming tetrominoes
+         self.draw_status()
+
+         # show the canvas
+         stddraw.show(delay)
+      # draw the game over GUI
+      else:
+         # set pen color based on game mode
+         if grid.gamemode == "tetris":
+            stddraw.setPenColor(stddraw.WHITE)
+         else:
+            stddraw.setPenColor(self.boundary_color)
+
+         # set font and its size
+         stddraw.setFontFamily("Arial")
+         stddraw.setFontSize(24)
+
+         # draw game over text and and final score
+         stddraw.text(13.75, 12, "Game Over!")
+         stddraw.text(13.75, 10, "Final Score:")
+         stddraw.boldText(13.75, 9, str(grid.score))
+
+         # draw the high score conclusion
+         stddraw.setFontSize(18)
+         if grid.old_high_score is None or grid.score > grid.old_high_score:
+            stddraw.text(13.75, 7.75, "New High Score!")
+         else:
+            stddraw.text(13.75, 7.75, "High Score:")
+            stddraw.boldText(13.75, 7, str(grid.old_high_score))
+
+         # draw the after-game controls
+         stddraw.setFontSize(16)
+         stddraw.text(13.75,2,"Press R to")
+         stddraw.text(13.75,1.5,"restart the game,")
+         stddraw.text(13.75,1,"or press Enter to")
+         stddraw.text(13.75,0.5,"return to the")
+         stddraw.text(13.75,0,"main manu.")
+
+         # show the canvas
+         stddraw.show(delay)
+
+   # Method for getting the sprite keys drawn on every cell by (column, row), the keys of the tile on the game grid,
+   # the ghost and the current tetromino are listed in the order they are drawn (None if there is not one)
+   def cell_sprites(self):
+      grid = self.grid
+      cells = {}
+      rows, cols = np.nonzero(grid.cells)
+      for (row, col) in zip(rows.tolist(), cols.tolist()):
+         cells[(col, row)] = [(int(grid.cells[row, col]), False), None, None]
+      tetromino = grid.current_tetromino
+      if tetromino is not None:
+         if self.show_ghost:
+            distance = tetromino.drop_distance(grid)
+            for (x, y, value) in tetromino.get_cells():
+               if y - distance < grid.grid_height:
+                  cells.setdefault((x, y - distance), [None, None, None])[1] = (value, True)
+         for (x, y, value) in tetromino.get_cells():
+            if y < grid.grid_height:
+               cells.setdefault((x, y), [None, None, None])[2] = (value, tetromino.ghost)
+      return cells
+
+   # Method for getting what is shown on the side panel (the score and the upcoming tetrominoes)
+   def panel_contents(self):
+      grid = self.grid
+      upcoming = [grid.next_tetromino1, grid.next_tetromino2, grid.next_tetromino3]
+      return (grid.score, grid.reached_2048, [(t.type, t.orientation, list(t.values)) for t in upcoming if t is not None])
+
+   # Method for drawing again the cells whose sprites are changed since the last frame, and the side panel if its
+   # contents are changed, returns the changed rectangles of the canvas
+   def repaint(self, cells, panel):
+      grid = self.grid
+      layer = self.background_layer(True)
+      rects = []
+      changed = [cell for cell in set(cells) | set(self.last_cells) if cells.get(cell) != self.last_cells.get(cell)]
+      if len(changed) != 0:
+         # draw the board again on the rectangle that covers the changed cells
+         min_col = min(col for (col, row) in changed)
+         min_row = min(row for (col, row) in changed)
+         max_col = max(col for (col, row) in changed)
+         max_row = max(row for (col, row) in changed)
+         # the rectangle also covers the outlines of the cells and the pixels of the scaled board image that are
+         # off from the cells on the canvas
+         stddraw.setPenRadius(Tile.boundary_thickness)
+         rect = stddraw.coveringRect(min_col - 0.5, min_row - 0.5, max_col - min_col + 1, max_row - min_row + 1)
+         stddraw.setPenRadius()  # reset the pen radius to its default value
+         stddraw.setClip(rect)
+         stddraw.layer(layer)
+         self.draw_board()
+         rects.append(rect)
+      if panel != self.last_panel:
+         rect = stddraw.coveringRect(grid.grid_width - 0.2, -1, 4.2, grid.grid_height + 1)
+         stddraw.setClip(rect)
+         stddraw.layer(layer)
+         self.draw_status()
+         rects.append(rect)
+      stddraw.setClip()
+      self.last_cells = cells
+      self.last_panel = panel
+      return rects
+
+   # Method for drawing the score and the upcoming tetrominoes on the side panel
+   def draw_status(self):
+      grid = self.grid
+      # set pen color based on game mode
+      if grid.gamemode == "tetris":
+         stddraw.setPenColor(stddraw.WHITE)
+      else:
+         stddraw.setPenColor(self.boundary_color)
+
+      # set font and its size
+      stddraw.setFontFamily("Arial")
+      stddraw.setFontSize(24)
+
+      # draw score
+      if grid.gamemode == "2048" and grid.reached_2048:
+         stddraw.boldText(13.75, 19, "Congrats!")
+         stddraw.text(13.75, 17.75, "Score")
+         stddraw.boldText(13.75, 16.75, str(grid.score))
+      else:
+         stddraw.text(13.75, 19, "Score")
+         stddraw.boldText(13.75, 18, str(grid.score))
+
+      # draw upcoming tetrominoes
+      self.draw_upcoming(grid.next_tetromino1, 9.5)
+      self.draw_upcoming(grid.next_tetromino2, 5)
+      self.draw_upcoming(grid.next_tetromino3, 0.5)
+
+   # Method for drawing the background of the canvas, the boundaries and the lines of the game grid and the side
+   # panel of the upcoming tetrominoes if panel is true. They never change during a game, so they are drawn once
+   # on a layer for every canvas state and the layer is drawn at once.
+   def draw_background(self, panel):
+      stddraw.layer(self.background_layer(panel))
+
+   # Method for getting the layer of the background, it is drawn when it is used for the first time
+   def background_layer(self, panel):
+      grid = self.grid
+      key = (grid.gamemode, grid.grid_height, grid.grid_width, stddraw.getCanvasState(), panel)
+      layer = _BACKGROUNDS.get(key)
+      if layer is None:
+         layer = stddraw.createSurface(False)
+         stddraw.setSurface(layer)
+         # clear the layer to background_color
+         stddraw.clear(self.background_color)
+         # draw a box around the game grid
+         self.draw_boundaries()
+         # draw the lines of the game grid
+         self.draw_lines()
+         # draw the side panel
+         if panel:
+            self.draw_panel()
+         stddraw.setSurface()
+         _BACKGROUNDS[key] = layer
+      return layer
+
+   # Method for drawing the labels, the box and the dividers of the upcoming tetrominoes on the side panel
+   def draw_panel(self):
+      # set pen color based on game mode
+      if self.grid.gamemode == "tetris":
+         stddraw.setPenColor(stddraw.WHITE)
+      else:
+         stddraw.setPenColor(self.boundary_color)
+      # set font and its size
+      stddraw.setFontFamily("Arial")
+      stddraw.setFontSize(24)
+      stddraw.text(13.75, 15, "Upcoming")
+      stddraw.text(13.75, 14, "Tetrominoes")
+      stddraw.setPenColor(self.boundary_color)
+      stddraw.filledRectangle(12,-0.25,3.5,13.5)
+      stddraw.setPenRadius(0.001)
+      if self.grid.gamemode == "tetris":
+         stddraw.setPenColor(stddraw.DARK_GRAY)
+      else:
+         stddraw.setPenColor(self.empty_cell_color)
+      stddraw.line(12.25, 8.75, 15.25, 8.75)
+      stddraw.line(12.25, 4.25, 15.25, 4.25)
+      stddraw.setPenRadius()  # reset the pen radius to its default value
+
+   # Method for drawing the inner lines of the grid
+   def draw_lines(self):
+      grid = self.grid
+      # draw the inner lines of the grid
+      stddraw.setPenColor(self.line_color)
+      stddraw.setPenRadius(self.line_thickness)
+      # x and y ranges for the game grid
+      start_x, end_x = -0.5, grid.grid_width - 0.5
+      start_y, end_y = -0.5, grid.grid_height - 0.5
+      for x in np.arange(start_x + 1, end_x, 1):  # vertical inner lines
+         stddraw.line(x, start_y, x, end_y)
+      for y in np.arange(start_y + 1, end_y, 1):  # horizontal inner lines
+         stddraw.line(start_x, y, end_x, y)
+      stddraw.setPenRadius()  # reset the pen radius to its default value
+
+   # Method for drawing the tiles on the cells of the grid, the current tetromino and its ghost at once as an image
+   # of palette indices (a cell of the image for every cell of the grid), then the numbers on the tiles in 2048 mode
+   def draw_board(self):
+      grid = self.grid
+      # get the positions of the tiles that are still falling, they are drawn on their way after the board (the
+      # tiles that are merged into the tiles below them are not drawn anymore)
+      falling = {cell: y for (cell, y) in self.fall_positions().items() if grid.cells[cell] != 0}
+      values = grid.cells.astype(np.int64)
+      for (row, col) in falling:
+         values[row, col] = 0
+      # get the palette indices of the tiles on the grid
+      indices = np.where(values > 0, self.palette_index(values, False), 0)
+      tetromino = grid.current_tetromino
+      if tetromino != None:
+         # add the ghost of the current tetromino on the rows where it would land if it is dropped
+         if self.show_ghost:
+            distance = tetromino.drop_distance(grid)
+            for (x, y, value) in tetromino.get_cells():
+               if y - distance < grid.grid_height:
+                  indices[y - distance, x] = self.palette_index(value, True)
+                  values[y - distance, x] = 0
+         # add the current tetromino, considering newly entered tetrominoes to the game grid that may have tiles
+         # with position.y >= grid_height
+         for (x, y, value) in tetromino.get_cells():
+            if y < grid.grid_height:
+               indices[y, x] = self.palette_index(value, tetromino.ghost)
+               values[y, x] = 0 if tetromino.ghost else value
+      stddraw.indexedImage(indices, self.palette, -0.5, -0.5, grid.grid_width, grid.grid_height, self.outlines)
+
+      # draw the numbers on the tiles
+      if grid.gamemode == "2048":
+         rows, cols = np.nonzero(values)
+         stddraw.sprites([(self.get_glyph(int(values[row, col])), col, row)
+                          for (row, col) in zip(rows.tolist(), cols.tolist())])
+      # draw the falling tiles
+      stddraw.sprites([(self.get_sprite(int(grid.cells[row, col])), col, y) for ((row, col), y) in falling.items()])
+
+   # Method for getting the index of the background color of the tile with the given cell value (or array of cell
+   # values) in the palette of the board, the index of its boundary color is palette_size more
+   def palette_index(self, value, ghost):
+      return 2 * np.minimum(value, (self.palette_size - 1) // 2) - (0 if ghost else 1)
+
+   # Method for drawing the boundaries around the game grid
+   def draw_boundaries(self):
+      grid = self.grid
+      # draw a bounding box around the game grid as a rectangle
+      stddraw.setPenColor(self.boundary_color)  # using boundary_color
+      # set the pen radius as box_thickness (half of this thickness is visible
+      # for the bounding box as its lines lie on the boundaries of the canvas)
+      #stddraw.setPenRadius(self.box_thickness)
+      # coordinates of the bottom left corner of the game grid
+      pos_x, pos_y = -0.75, -0.75
+      stddraw.filledRectangle(pos_x, pos_y, grid.grid_width+0.50, grid.grid_height+0.50)
+      stddraw.setPenColor(self.empty_cell_color)
+      pos_x, pos_y = -0.5, -0.5
+      stddraw.filledRectangle(pos_x, pos_y, grid.grid_width, grid.grid_height)
+      stddraw.setPenRadius()  # reset the pen radius to its default value
+
+   # Method for creating the tile to be drawn on the given position with the given cell value
+   def make_tile(self, x, y, value, ghost=False):
+      if self.grid.gamemode == "2048":
+         return Tile(Point(x, y), "2048", ghost, number=1 << value)
+      return Tile(Point(x, y), "tetris", ghost, type=TETROMINO_TYPES[value - 1])
+
+   # Method for rendering the sprites of the tiles again if the size or the scales of the canvas are changed
+   def update_sprites(self):
+      state = stddraw.getCanvasState()
+      if state == self.sprites_state:
+         return
+      self.sprites = {}
+      self.glyphs = {}
+      self.sprites_state = state
+      # render the tiles of every tetromino type in classic tetris mode and the numbers up to 2048 in 2048 mode,
+      # the other tiles are rendered when they are first drawn
+      values = range(1, len(TETROMINO_TYPES) + 1) if self.grid.gamemode == "tetris" else range(1, 12)
+      for value in values:
+         self.get_sprite(value)
+         self.get_sprite(value, True)
+
+      # set up the palette of the board with the colors of the tiles, the background colors of the tiles come after
+      # the empty cell color and their boundary colors come after them in the same order
+      count = len(TETROMINO_TYPES) if self.grid.gamemode == "tetris" else MAX_PALETTE_VALUE
+      tiles = [self.make_tile(0, 0, value, ghost) for value in range(1, count + 1) for ghost in (False, True)]
+      self.palette_size = len(tiles) + 1
+      self.palette = [self.empty_cell_color] + [tile.background_color for tile in tiles]
+      self.palette += [self.empty_cell_color] + [tile.boundary_color for tile in tiles]
+      # get the pixels of the bounding boxes of the cells in the board image
+      stddraw.setPenRadius(Tile.boundary_thickness)
+      self.outlines = stddraw.blockBoundaries(self.grid.grid_height, self.grid.grid_width, -0.5, -0.5,
+                                              self.grid.grid_width, self.grid.grid_height)
+      stddraw.setPenRadius()  # reset the pen radius to its default value
+      self.outlines *= self.palette_size
+
+   # Method for getting the sprite of the tile with the given cell value, the sprite is rendered by drawing the
+   # tile once on a transparent surface if it is not rendered yet
+   def get_sprite(self, value, ghost=False):
+      key = (value, ghost)
+      sprite = self.sprites.get(key)
+      if sprite is None:
+         surface = stddraw.createSurface()
+         stddraw.setSurface(surface)
+         self.draw_tile(self.make_tile(0, 0, value, ghost))
+         stddraw.setSurface()
+         # the sprite covers the cell and the part of its bounding box outside the cell
+         sprite = stddraw.subSurface(surface, -0.6, -0.6, 1.2, 1.2)
+         self.sprites[key] = sprite
+      return sprite
+
+   # Method for getting the number of the tile with the given cell value as a transparent image of its cell, it is
+   # rendered once as the tiles draw their numbers
+   def get_glyph(self, value):
+      glyph = self.glyphs.get(value)
+      if glyph is None:
+         surface = stddraw.createSurface()
+         stddraw.setSurface(surface)
+         self.draw_number(self.make_tile(0, 0, value))
+         stddraw.setSurface()
+         glyph = stddraw.subSurface(surface, -0.5, -0.5, 1, 1)
+         self.glyphs[value] = glyph
+      return glyph
+
+   # Method for drawing the given upcoming tetromino centered in its box on the side panel, the
+   # bottom of the box is given
+   def draw_upcoming(self, tetromino, box_y):
+      cells = tetromino.get_cells()
+      # position the bottom-left corner of the occupied cells
+      start_x = 14.25 - tetromino.column_count / 2
+      start_y = box_y + (4 - tetromino.row_count) / 2
+      min_x = min(x for (x, y, value) in cells)
+      min_y = min(y for (x, y, value) in cells)
+      for (x, y, value) in cells:
+         stddraw.sprite(self.get_sprite(value, tetromino.ghost), start_x + x - min_x, start_y + y - min_y)
+
+   # Method for drawing the given tile, used for rendering the sprites of the tiles
+   def draw_tile(self, tile):
+      # draw the tile as a filled square with its bounding box
+      if tile.background_color == None or tile.boundary_color == None:
+         return
+      self.draw_cell(tile.position.x, tile.position.y, tile.background_color, tile.boundary_color)
+
+      # draw the number on the tile
+      if tile.gamemode == "2048" and tile.ghost == False:
+         self.draw_number(tile)
+
+   # Method for drawing the number of the given tile on its position
+   def draw_number(self, tile):
+      stddraw.setPenColor(tile.foreground_color)
+      stddraw.setFontFamily(Tile.font_family)
+      stddraw.setFontSize(Tile.font_size)
+      stddraw.boldText(tile.position.x, tile.position.y, str(tile.number))
+
+   # Method for drawing a cell on the given position as a filled square with its bounding box
+   def draw_cell(self, x, y, background_color, boundary_color):
+      stddraw.setPenColor(background_color)
+      stddraw.filledSquare(x, y, 0.5)
+      # draw the bounding box of the cell as a square
+      stddraw.setPenColor(boundary_color)
+      stddraw.setPenRadius(Tile.boundary_thickness)
+      stddraw.square(x, y, 0.5)
+      stddraw.setPenRadius()  # reset the pen radius to its default value
@@ -42,6 +42,7 @@ class Picture:
         If neither arg1 nor arg2 is None, then construct self such that
         it is all black with width arg1 and and height arg2.
         """
+        self._converted = False
         if (arg1 is None) and (arg2 is None):
             maxW = _DEFAULT_WIDTH
             maxH = _DEFAULT_HEIGHT
@@ -103,3 +104,27 @@ class Picture:
         """
         pygameColor = pygame.Color(c.getRed(), c.getGreen(), c.getBlue(), 0)
         self._surface.set_at((x, y), pygameColor)
+
+    #-------------------------------------------------------------------
+    # Begin added by Ege Kaan Isik
+    #-------------------------------------------------------------------
+
+    def convert(self):
+        """
+        Convert the pixels of self to the pixel format of the display
+        (keeping the transparency of the image, if any), so that self
+        is drawn without converting every pixel each time. Do nothing
+        if self is already converted or if there is no display yet.
+        Return True if self is in the format of the display.
+        """
+        if not self._converted and pygame.display.get_surface() is not None:
+            if self._surface.get_flags() & pygame.SRCALPHA:
+                self._surface = self._surface.convert_alpha()
+            else:
+                self._surface = self._surface.convert()
+            self._converted = True
+        return self._converted
+
+    #-------------------------------------------------------------------
+    # End added by Ege Kaan Isik
+    #-------------------------------------------------------------------
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# add the current directory to the system path
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import random # used for the random number generator of the pieces
+import numpy as np # fundamental Python module for scientific computing
+from tetromino import Tetromino, TETROMINO_TYPES, ORIENTATIONS # class for modeling the tetrominoes and their types
+
+# the ways of choosing the types of the pieces: every type is equally likely for every piece ("uniform"), or the
+# types are dealt from shuffled bags of all the seven types ("bag")
+RANDOMIZERS = ("uniform", "bag")
+# the sizes of the tile matrices of the tetromino types
+SIZES = np.array([ORIENTATIONS[type][0].n for type in TETROMINO_TYPES])
+
+# Class used for creating the pieces (tetrominoes) of a game from a seeded random number generator, so that the
+# same seed always gives the same pieces with the same numbers. The upcoming pieces are held in a ring buffer
+# with the given preview length (0 for the generators that only create pieces in bulk).
+class PieceGenerator:
+   # Constructor that creates a generator for the given grid size and game mode. A random seed is chosen if no
+   # seed is given, the seed of the generator is kept in the seed field.
+   def __init__(self, grid_height, grid_width, gamemode, seed=None, randomizer="uniform", preview=3):
+      if randomizer not in RANDOMIZERS:
+         raise ValueError("Unknown randomizer: " + str(randomizer))
+      self.grid_height = grid_height
+      self.grid_width = grid_width
+      self.gamemode = gamemode
+      self.randomizer = randomizer
+      self.preview_length = preview
+      self.reset(seed)
+
+   # Method for starting the pieces over with the given seed (a new random seed if it is not given)
+   def reset(self, seed=None):
+      self.seed = seed if seed is not None else random.randrange(2**32)
+      self.rng = random.Random(self.seed)
+      # the types that are left in the current bag (bag randomizer only)
+      self.bag = []
+      # the ring buffer of the upcoming pieces, the first upcoming piece is on the head index
+      self.buffer = [self.create() for i in range(self.preview_length)]
+      self.head = 0
+
+   # Method for getting the type index, column of the bottom-left corner and cell values of a new piece
+   def draw(self):
+      # choose the type of the piece
+      if self.randomizer == "bag":
+         if len(self.bag) == 0:
+            self.bag = list(range(len(TETROMINO_TYPES)))
+            self.rng.shuffle(self.bag)
+         type = self.bag.pop()
+      else:
+         type = self.rng.randrange(len(TETROMINO_TYPES))
+      # choose a random column where the tile matrix of the piece fits on the grid
+      n = ORIENTATIONS[TETROMINO_TYPES[type]][0].n
+      x = self.rng.randint(0, self.grid_width - n)
+      # give every cell a random number which can be 2 or 4 only in 2048 mode, the cells have the type index
+      # + 1 in classic tetris mode
+      if self.gamemode == "2048":
+         values = [self.rng.randint(1, 2) for i in range(4)]
+      else:
+         values = [type + 1] * 4
+      return type, x, values
+
+   # Method for creating a new piece as a tetromino that enters the game grid from the top
+   def create(self):
+      type, x, values = self.draw()
+      return Tetromino(TETROMINO_TYPES[type], self.grid_height, self.grid_width, x, values=values, gamemode=self.gamemode)
+
+   # Method for getting the next piece, the upcoming pieces move forward and a new piece is created at the end
+   def next(self):
+      if self.preview_length == 0:
+         return self.create()
+      piece = self.buffer[self.head]
+      self.buffer[self.head] = self.create()
+      self.head = (self.head + 1) % self.preview_length
+      return piece
+
+   # Method for getting the upcoming pieces in their order without using them
+   def preview(self):
+      return [self.buffer[(self.head + i) % self.preview_length] for i in range(self.preview_length)]
+
+   # Method for creating the given number of pieces at once for the batch simulations, returns the type indexes,
+   # the columns and the cell values of the pieces as arrays. The pieces are created by a numpy random number
+   # generator seeded from the random sequence of the generator, so they are not the same pieces as the ones that
+   # next() would give, but they are the same for the same seed. They do not pass through the preview.
+   def bulk(self, count):
+      rng = np.random.default_rng(self.rng.getrandbits(64))
+      # choose the types, deal them from the current bag and then from new shuffled bags of all the types
+      if self.randomizer == "bag":
+         T = len(TETROMINO_TYPES)
+         bags = max(0, -(-(count - len(self.bag)) // T))
+         shuffled = np.argsort(rng.random((bags, T)), axis=1).ravel()
+         # the types of a bag are popped from its end
+         dealt = np.concatenate([np.array(self.bag[::-1], dtype=np.int64), shuffled])
+         types = dealt[:count]
+         self.bag = dealt[count:][::-1].tolist()
+      else:
+         types = rng.integers(len(TETROMINO_TYPES), size=count)
+      # choose random columns where the tile matrices of the pieces fit on the grid
+      xs = rng.integers(0, self.grid_width - SIZES[types] + 1)
+      # give every cell a random number which can be 2 or 4 only in 2048 mode, the cells have the type index
+      # + 1 in classic tetris mode
+      if self.gamemode == "2048":
+         values = rng.integers(1, 3, size=(count, 4), dtype=np.uint8)
+      else:
+         values = np.repeat(types[:, None] + 1, 4, axis=1).astype(np.uint8)
+      return types, xs, values
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# add the current directory to the system path
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+# draw on a window that is not shown if there is no display to draw on (e.g. on a server)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse # used for parsing the command line arguments
+import random # used for choosing the actions of the games
+import numpy as np # fundamental Python module for scientific computing
+import stddraw # the stddraw module is used as a basic graphics library
+from game_env import GameEnv # class for playing the game as an environment
+
+# Function for playing a game with random actions and checking that every frame that the renderer draws partly
+# (by repainting only the changed cells and panels) has exactly the same pixels as the frame drawn fully by
+# display(), returns the number of the checked frames and the (frame, pixel count, first pixel, last pixel) of the
+# different frames
+def check_game(gamemode, seed, max_steps):
+   rng = random.Random("repaint-" + str(seed))
+   env = GameEnv(gamemode)
+   env.reset(seed)
+   env.render()
+   renderer = env.renderer
+   checked = 0
+   different = []
+   for frame in range(max_steps):
+      observation, reward, done, info = env.step(rng.randrange(len(env.actions)))
+      if done:
+         break
+      # the frame is drawn partly if the last frame is still on the canvas
+      partly = renderer.drawn_state is not None
+      renderer.display()
+      if not partly:
+         continue
+      repainted = stddraw.canvasPixels()
+      # draw the same frame fully and compare the pixels
+      renderer.drawn_state = None
+      renderer.display()
+      pixels = np.argwhere((stddraw.canvasPixels() != repainted).any(axis=2))
+      checked += 1
+      if len(pixels) != 0:
+         different.append((frame, len(pixels), tuple(pixels.min(axis=0).tolist()), tuple(pixels.max(axis=0).tolist())))
+   return checked, different
+
+# Function for checking the games given by the command line arguments and printing the results, exits with 1 if
+# any repainted frame is different from the fully drawn frame
+def main(argv=None):
+   parser = argparse.ArgumentParser(description="Checks that the partly repainted frames of the game grid are the "
+                                                "same as the fully drawn frames.")
+   parser.add_argument("--mode", choices=("tetris", "2048", "all"), default="all", help="game mode")
+   parser.add_argument("--seeds", type=int, default=10, help="number of the games for each game mode")
+   parser.add_argument("--max-steps", type=int, default=400, help="step limit of a game")
+   args = parser.parse_args(argv)
+
+   failed = False
+   for gamemode in (("tetris", "2048") if args.mode == "all" else (args.mode,)):
+      frames = 0
+      mismatches = 0
+      for seed in range(args.seeds):
+         checked, different = check_game(gamemode, seed, args.max_steps)
+         frames += checked
+         mismatches += len(different)
+         for (frame, count, first, last) in different:
+            print("%s seed %d frame %d: %d pixels from %s to %s are different" % (gamemode, seed, frame, count, first,
+                                                                                 last))
+      print("Checked %d repainted frames of %d %s games, %d are different from the fully drawn frames" % (
+         frames, args.seeds, gamemode, mismatches))
+      failed = failed or mismatches != 0
+   if failed:
+      sys.exit(1)
+
+if __name__ == "__main__":
+   main()
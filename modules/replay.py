@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# add the current directory to the system path
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import atexit # used for finishing the replay files when the program exits
+import queue # used for passing the written bytes to the writer thread
+import struct # used for packing the header of the replay files
+import threading # used for writing the replay files without blocking the game
+from game_engine import ACTIONS # the actions that can be given to the game engine
+from piece_generator import RANDOMIZERS # the ways of choosing the types of the tetrominoes
+
+# The replay files start with a header and continue with one record for every action that is applied to the
+# game, so that the game can be played again by giving the same actions to a game engine with the same seed.
+#
+# header:  the magic bytes, the format version, the game mode (0 for tetris, 1 for 2048), the difficulty, the
+#          grid height, the grid width and the randomizer as bytes, then the milliseconds of a tick and the
+#          seed as varints
+# records: a varint of (tick - tick of the previous record) << 3 | action code, the action code is the index
+#          of the action in ACTIONS, most of the records take a single byte
+# end:     a record with the END code followed by a varint of the final score, the replays of the games that
+#          were closed before they ended do not have it
+MAGIC = b"T2RP"
+VERSION = 1
+END = 7
+GAMEMODES = ("tetris", "2048")
+
+# the number of the buffered bytes that are passed to the writer thread at once
+FLUSH_SIZE = 4096
+
+# the writers whose threads are still writing, they are closed and waited for when the program exits
+_writers = set()
+
+# Function for adding the given non-negative integer to the given byte array as a varint (7 bits per byte,
+# the highest bit is set on all bytes but the last one)
+def write_varint(buffer, value):
+   while value >= 0x80:
+      buffer.append((value & 0x7F) | 0x80)
+      value >>= 7
+   buffer.append(value)
+
+# Function for reading a varint from the given bytes at the given position, returns the value and the
+# position after the varint
+def read_varint(data, position):
+   value = shift = 0
+   while True:
+      if position >= len(data):
+         raise ValueError("Truncated replay file")
+      byte = data[position]
+      position += 1
+      value |= (byte & 0x7F) << shift
+      if byte < 0x80:
+         return value, position
+      shift += 7
+
+# Class used for recording a game into a replay file. The records are collected in a buffer and written by a
+# background thread, so the game loop never waits for the disk.
+class ReplayWriter:
+   # Constructor that creates the replay file at the given path and writes the header of the given game. An
+   # existing file is never overwritten, a number is added to the name of the file if the path is taken (the
+   # path field has the path of the created file).
+   def __init__(self, path, gamemode, difficulty, seed, grid_h, grid_w, randomizer="uniform", tick_ms=10):
+      directory = os.path.dirname(path)
+      if directory != "":
+         os.makedirs(directory, exist_ok=True)
+      name, extension = os.path.splitext(path)
+      number = 0
+      while True:
+         try:
+            self.file = open(path, "xb")
+            break
+         except FileExistsError:
+            number += 1
+            path = name + "-" + str(number) + extension
+      self.path = path
+      self.tick_ms = tick_ms
+      # the tick of the last record, the ticks are written as the difference from it
+      self.last_tick = 0
+      self.closed = False
+      self.buffer = bytearray(MAGIC)
+      self.buffer += struct.pack("<6B", VERSION, GAMEMODES.index(gamemode), difficulty, grid_h, grid_w,
+                                 RANDOMIZERS.index(randomizer))
+      write_varint(self.buffer, tick_ms)
+      write_varint(self.buffer, seed)
+      # the chunks of bytes waiting to be written, None stops the writer thread
+      self.chunks = queue.Queue()
+      # the thread does not keep the program running, the unfinished replays are closed when the program exits
+      self.thread = threading.Thread(target=self.write_chunks, daemon=True)
+      _writers.add(self)
+      self.thread.start()
+
+   # Method that runs on the writer thread and writes the chunks until the replay is closed
+   def write_chunks(self):
+      with self.file as file:
+         while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+               break
+            file.write(chunk)
+      _writers.discard(self)
+
+   # Method for passing the buffered bytes to the writer thread
+   def flush(self):
+      if len(self.buffer) != 0:
+         self.chunks.put(bytes(self.buffer))
+         self.buffer.clear()
+
+   # Method for recording the given action applied at the given tick
+   def record(self, tick, action):
+      if self.closed:
+         return
+      write_varint(self.buffer, (tick - self.last_tick) << 3 | ACTIONS.index(action))
+      self.last_tick = tick
+      if len(self.buffer) >= FLUSH_SIZE:
+         self.flush()
+
+   # Method for ending the replay with the given final score (no end record if the score is not given) and
+   # closing the file after the remaining bytes are written
+   def close(self, score=None):
+      if self.closed:
+         return
+      self.closed = True
+      if score is not None:
+         write_varint(self.buffer, END)
+         write_varint(self.buffer, score)
+      self.flush()
+      self.chunks.put(None)
+
+# Function for closing the replays that are still being written and waiting for their files to be written, it is
+# called when the program exits (e.g. after an error in the game loop)
+def close_writers():
+   for writer in list(_writers):
+      writer.close()
+      writer.thread.join()
+
+atexit.register(close_writers)
+
+# Class used for representing a recorded game read from a replay file
+class Replay:
+   # Constructor that creates a replay with the given game settings, the (tick, action) pairs of the applied
+   # actions and the final score (None if the game was not ended)
+   def __init__(self, gamemode, difficulty, seed, grid_h, grid_w, randomizer, tick_ms, actions, score):
+      self.gamemode = gamemode
+      self.difficulty = difficulty
+      self.seed = seed
+      self.grid_height = grid_h
+      self.grid_width = grid_w
+      self.randomizer = randomizer
+      self.tick_ms = tick_ms
+      self.actions = actions
+      self.score = score
+
+# Function for reading the replay file at the given path
+def read_replay(path):
+   with open(path, "rb") as file:
+      data = file.read()
+   if data[:len(MAGIC)] != MAGIC:
+      raise ValueError("Not a replay file: " + str(path))
+   position = len(MAGIC)
+   version, gamemode, difficulty, grid_h, grid_w, randomizer = struct.unpack_from("<6B", data, position)
+   if version != VERSION:
+      raise ValueError("Unsupported replay version: " + str(version))
+   position += 6
+   tick_ms, position = read_varint(data, position)
+   seed, position = read_varint(data, position)
+
+   # read the records until the end record or the end of the file
+   actions = []
+   score = None
+   tick = 0
+   while position < len(data):
+      value, position = read_varint(data, position)
+      if value & 0x7 == END:
+         score, position = read_varint(data, position)
+         break
+      tick += value >> 3
+      actions.append((tick, ACTIONS[value & 0x7]))
+   return Replay(GAMEMODES[gamemode], difficulty, seed, grid_h, grid_w, RANDOMIZERS[randomizer], tick_ms, actions, score)
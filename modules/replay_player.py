@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# add the current directory to the system path
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import argparse # used for parsing the command line arguments
+import time # used for timing and pacing the replays
+from game_engine import GameEngine # class for running the rules of a game without drawing anything
+from piece_generator import PieceGenerator # class for creating the tetrominoes from a seed
+from replay import read_replay # function for reading the replay files
+
+# Class used for playing a recorded game again. The recorded actions are given to a game engine with the same
+# seed in the same order, so the game ends with the same grid and score. The timing of the game does not
+# matter since every action is applied instantly by the engine.
+class ReplayPlayer:
+   # Constructor that creates a player for the given replay
+   def __init__(self, replay):
+      self.replay = replay
+      generator = PieceGenerator(replay.grid_height, replay.grid_width, replay.gamemode, replay.seed, replay.randomizer)
+      self.engine = GameEngine(replay.grid_height, replay.grid_width, replay.gamemode, replay.difficulty, generator)
+      # the index of the next action to apply
+      self.position = 0
+
+   # Method for checking whether all the actions are applied
+   def finished(self):
+      return self.position == len(self.replay.actions)
+
+   # Method for applying all the actions recorded up to the given tick (all the remaining actions if the tick is
+   # not given), returns the number of the applied actions
+   def advance(self, tick=None):
+      actions = self.replay.actions
+      start = self.position
+      while self.position < len(actions) and (tick is None or actions[self.position][0] <= tick):
+         self.engine.step(actions[self.position][1])
+         self.position += 1
+      return self.position - start
+
+# Function for playing the given replay with the given speed multiplier (as fast as possible if it is not given),
+# the game is drawn at most fps times per second if render is true and the actions between two drawn frames are
+# applied without drawing. Returns the results of the replay, matches is None if the replay does not have a final
+# score to check (e.g. the game was closed before it ended).
+def play_replay(replay, speed=None, render=False, fps=30):
+   player = ReplayPlayer(replay)
+   engine = player.engine
+   renderer = None
+   if render:
+      # the renderer is only imported when it is needed so that the replays can be played without a display
+      import stddraw
+      from grid_renderer import GridRenderer
+      stddraw.setCanvasSize(35 * replay.grid_width + 140, 35 * replay.grid_height + 1)
+      stddraw.setXscale(-1, replay.grid_width + 4)
+      stddraw.setYscale(-1, replay.grid_height)
+      renderer = GridRenderer(engine.grid, show_ghost=(replay.difficulty != 3))
+      # the events are not animated, the animations would slow down the replay
+      engine.grid.listener = None
+
+   start = time.perf_counter()
+   if speed is None and renderer is None:
+      player.advance()
+   else:
+      frame_seconds = 1 / fps
+      while not player.finished():
+         frame_start = time.perf_counter()
+         if speed is None:
+            # skip to the tick of the next action
+            player.advance(replay.actions[player.position][0])
+         else:
+            # apply the actions up to the current game time
+            player.advance((frame_start - start) * 1000 * speed / replay.tick_ms)
+         if renderer is not None:
+            engine.grid.collect_events()
+            renderer.display()
+         # wait for the next frame
+         if speed is not None:
+            time.sleep(max(0, frame_seconds - (time.perf_counter() - frame_start)))
+   seconds = time.perf_counter() - start
+
+   return {
+      "score": engine.grid.score,
+      "recorded_score": replay.score,
+      "matches": None if replay.score is None else engine.grid.score == replay.score,
+      "game_over": engine.grid.game_over,
+      "actions": len(replay.actions),
+      "seconds": seconds,
+   }
+
+# Function for playing the replay given by the command line arguments and printing its results, exits with 1 if
+# the score does not match the recorded score (a replay without a recorded score is reported as not verified)
+def main(argv=None):
+   parser = argparse.ArgumentParser(description="Plays a recorded Tetris 2048 game again and checks its score.")
+   parser.add_argument("replay", help="path of the replay file")
+   parser.add_argument("--speed", type=float, default=None,
+                       help="speed multiplier (e.g. 1, 10, 100), as fast as possible if it is not given")
+   parser.add_argument("--render", action="store_true", help="draw the game while it is replayed")
+   parser.add_argument("--fps", type=int, default=30, help="maximum number of the drawn frames per second")
+   parser.add_argument("--repeat", type=int, default=1, help="number of times to play the replay for benchmarking")
+   args = parser.parse_args(argv)
+
+   replay = read_replay(args.replay)
+   seconds = 0
+   for i in range(args.repeat):
+      results = play_replay(replay, args.speed, args.render, args.fps)
+      seconds += results["seconds"]
+
+   if results["matches"] is None:
+      verdict = "not verified, no recorded score"
+   else:
+      verdict = "match" if results["matches"] else "MISMATCH"
+   print("Replayed %d actions %d time(s) in %.3f seconds (%.0f actions per second), score %d, recorded score %s: %s" % (
+      results["actions"], args.repeat, seconds, results["actions"] * args.repeat / seconds if seconds > 0 else 0,
+      results["score"], results["recorded_score"], verdict))
+   if results["matches"] is False:
+      sys.exit(1)
+
+if __name__ == "__main__":
+   main()
@@ -18,10 +18,14 @@ sys.path.append(os.path.dirname(os.path.realpath(__file__)))
 
 import color
 import time
+import math
+import collections
+import numpy
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = 'hide'
 import pygame
 import pygame.gfxdraw
 import pygame.font
+import pygame.surfarray
 
 import tkinter as Tkinter
 import tkinter.messagebox as tkMessageBox
@@ -80,6 +84,19 @@ _ymax = None
 _fontFamily = _DEFAULT_FONT_FAMILY
 _fontSize = _DEFAULT_FONT_SIZE
 
+# The Font objects by (family, size, bold), so that every font is
+# looked up on the system only once
+_fonts = {}
+
+# The least recently used cache of the rendered text surfaces by
+# (string, family, size, bold, color), its maximum size and the
+# numbers of the hits and misses for tuning its size
+_DEFAULT_TEXT_CACHE_SIZE = 256
+_textCache = collections.OrderedDict()
+_textCacheSize = _DEFAULT_TEXT_CACHE_SIZE
+_textCacheHits = 0
+_textCacheMisses = 0
+
 _canvasWidth = float(_DEFAULT_CANVAS_SIZE)
 _canvasHeight = float(_DEFAULT_CANVAS_SIZE)
 _penRadius = None
@@ -93,6 +110,27 @@ _keysReleased = []
 # Has the window been created?
 _windowCreated = False
 
+#-----------------------------------------------------------------------
+# Begin added by Ege Kaan Isik
+#-----------------------------------------------------------------------
+
+# The maximum number of frames shown per second (None for no limit),
+# and the clock that paces the frames
+_frameRate = None
+_frameClock = None
+
+# The background canvas while the drawings are made on another
+# surface (None if the drawings are made on the background canvas)
+_canvasSurface = None
+
+# The number of times the canvas is cleared, the drawings kept on the
+# canvas from the previous frames are replaced when it changes
+_clearCount = 0
+
+#-----------------------------------------------------------------------
+# End added by Ege Kaan Isik
+#-----------------------------------------------------------------------
+
 #-----------------------------------------------------------------------
 # Begin added by Alan J. Broder
 #-----------------------------------------------------------------------
@@ -274,6 +312,8 @@ def setFontFamily(f=_DEFAULT_FONT_FAMILY):
     """
     global _fontFamily
     _fontFamily = f
+    _getFont()
+    _getFont(True)
 
 def setFontSize(s=_DEFAULT_FONT_SIZE):
     """
@@ -281,6 +321,66 @@ def setFontSize(s=_DEFAULT_FONT_SIZE):
     """
     global _fontSize
     _fontSize = s
+    _getFont()
+    _getFont(True)
+
+#---------------------------------------------------------------
+# Begin added by Ege Kaan Isik
+#---------------------------------------------------------------
+
+def _getFont(bold=False):
+    """
+    Return the Font object of the current font family and size,
+    the font is created only the first time it is used.
+    """
+    key = (_fontFamily, _fontSize, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(_fontFamily, _fontSize, bold)
+        _fonts[key] = font
+    return font
+
+def _renderText(s, bold=False):
+    """
+    Return the surface of string s rendered with the current font
+    and pen color, the surface is taken from the text cache if the
+    same string was rendered the same way recently.
+    """
+    global _textCacheHits
+    global _textCacheMisses
+    key = (s, _fontFamily, _fontSize, bold, _penColor.getRed(), _penColor.getGreen(), _penColor.getBlue())
+    text = _textCache.get(key)
+    if text is not None:
+        _textCache.move_to_end(key)
+        _textCacheHits += 1
+        return text
+    _textCacheMisses += 1
+    text = _getFont(bold).render(s, 1, _pygameColor(_penColor))
+    _textCache[key] = text
+    if len(_textCache) > _textCacheSize:
+        _textCache.popitem(last=False)
+    return text
+
+def setTextCacheSize(size=_DEFAULT_TEXT_CACHE_SIZE):
+    """
+    Set the maximum number of rendered text surfaces kept in the
+    text cache to size (0 disables the cache).
+    """
+    global _textCacheSize
+    _textCacheSize = size
+    while len(_textCache) > _textCacheSize:
+        _textCache.popitem(last=False)
+
+def textCacheInfo():
+    """
+    Return the numbers of the hits and misses of the text cache and
+    its current and maximum size as a dictionary.
+    """
+    return {"hits": _textCacheHits, "misses": _textCacheMisses, "size": len(_textCache), "maxsize": _textCacheSize}
+
+#---------------------------------------------------------------
+# End added by Ege Kaan Isik
+#---------------------------------------------------------------
 
 #-----------------------------------------------------------------------
 
@@ -520,8 +620,7 @@ def text(x, y, s):
     y = float(y)
     xs = _scaleX(x)
     ys = _scaleY(y)
-    font = pygame.font.SysFont(_fontFamily, _fontSize)
-    text = font.render(s, 1, _pygameColor(_penColor))
+    text = _renderText(s)
     textpos = text.get_rect(center=(xs, ys))
     _surface.blit(text, textpos)
 
@@ -534,8 +633,7 @@ def boldText(x, y, s):
     y = float(y)
     xs = _scaleX(x)
     ys = _scaleY(y)
-    font = pygame.font.SysFont(_fontFamily, _fontSize, True)
-    text = font.render(s, 1, _pygameColor(_penColor))
+    text = _renderText(s, True)
     textpos = text.get_rect(center=(xs, ys))
     _surface.blit(text, textpos)
 
@@ -561,13 +659,204 @@ def picture(pic, x=None, y=None):
     picSurface = pic._surface # violates encapsulation
     _surface.blit(picSurface, [xs-ws/2.0, ys-hs/2.0, ws, hs])
 
+#---------------------------------------------------------------
+# Begin added by Ege Kaan Isik
+#---------------------------------------------------------------
+
+def getCanvasState():
+    """
+    Return the size of the canvas and the scales of its axes. The
+    drawings kept as pixels (e.g. sprites) stay valid as long as the
+    returned value does not change.
+    """
+    return (_canvasWidth, _canvasHeight, _xmin, _xmax, _ymin, _ymax)
+
+def createSurface(transparent=True):
+    """
+    Return a new surface of the size of the canvas to draw on with
+    setSurface(). The surface is fully transparent if transparent is
+    True, it is black otherwise.
+    """
+    _makeSureWindowCreated()
+    size = (int(_canvasWidth), int(_canvasHeight))
+    if transparent:
+        return pygame.Surface(size, pygame.SRCALPHA)
+    return pygame.Surface(size)
+
+def setSurface(surface=None):
+    """
+    Make the subsequent drawings on the given surface instead of the
+    background canvas. The drawings are made on the background canvas
+    again if surface is None.
+    """
+    global _surface
+    global _canvasSurface
+    _makeSureWindowCreated()
+    if _canvasSurface is None:
+        _canvasSurface = _surface
+    if surface is None:
+        _surface = _canvasSurface
+        _canvasSurface = None
+    else:
+        _surface = surface
+
+def clearCount():
+    """
+    Return the number of times the canvas is cleared. A drawing that
+    is updated partly from frame to frame has to be drawn again fully
+    when it changes, since the canvas is drawn over in the meantime.
+    """
+    return _clearCount
+
+def pixelRect(x, y, w, h):
+    """
+    Return the rectangle of width w and height h whose lower left
+    point is (x, y) as a pygame.Rect in pixels on the canvas.
+    """
+    xs = _scaleX(float(x))
+    ys = _scaleY(float(y))
+    return pygame.Rect(xs, ys - _factorY(h), _factorX(w), _factorY(h))
+
+def coveringRect(x, y, w, h):
+    """
+    Return the smallest rectangle in pixels that covers all the
+    pixels drawn for the rectangle of width w and height h whose lower
+    left point is (x, y), including the pixels of the scaled images
+    (e.g. drawn by indexedImage()) that can be off by a pixel and the
+    boundaries as thick as the current pen radius around its edges.
+    """
+    pad = 1 + max(1, int(round(_penRadius)))
+    left = math.floor(_scaleX(float(x))) - pad
+    top = math.floor(_scaleY(float(y + h))) - pad
+    right = math.ceil(_scaleX(float(x + w))) + pad
+    bottom = math.ceil(_scaleY(float(y))) + pad
+    return pygame.Rect(left, top, right - left, bottom - top)
+
+def canvasPixels():
+    """
+    Return a copy of the pixels of the background canvas as a 3D
+    array of colors indexed by [x][y] as in pygame.surfarray.
+    """
+    _makeSureWindowCreated()
+    return pygame.surfarray.array3d(_surface)
+
+def setClip(rect=None):
+    """
+    Limit the subsequent drawings to the given rectangle in pixels
+    (e.g. returned by pixelRect() or coveringRect()). There is no limit if rect is None.
+    """
+    _makeSureWindowCreated()
+    _surface.set_clip(rect)
+
+def subSurface(surface, x, y, w, h):
+    """
+    Return a copy of the part of the given surface that is covered by
+    the rectangle of width w and height h whose lower left point is
+    (x, y).
+    """
+    rect = pixelRect(x, y, w, h)
+    return surface.subsurface(rect.clip(surface.get_rect())).copy()
+
+def layer(s):
+    """
+    Draw the surface s of the size of the canvas (e.g. a surface
+    returned by createSurface()) on the whole background canvas.
+    """
+    _makeSureWindowCreated()
+    _surface.blit(s, (0, 0))
+
+def sprite(s, x, y):
+    """
+    Draw the surface s (e.g. a surface returned by subSurface()) on
+    the background canvas centered at (x, y).
+    """
+    _makeSureWindowCreated()
+    xs = _scaleX(float(x))
+    ys = _scaleY(float(y))
+    _surface.blit(s, (xs - s.get_width()/2.0, ys - s.get_height()/2.0))
+
+def sprites(items):
+    """
+    Draw every surface s of the given (s, x, y) items on the background
+    canvas centered at (x, y) with a single call.
+    """
+    _makeSureWindowCreated()
+    _surface.blits([(s, (_scaleX(x) - s.get_width()/2.0, _scaleY(y) - s.get_height()/2.0)) for (s, x, y) in items], False)
+
+def _scaledIndices(indices, rect):
+    """
+    Return the 2D array of indices (of any integer type) scaled to
+    the size of the given rectangle in pixels as a surface, the first
+    row of the array is the bottom row of the rectangle.
+    """
+    indices = numpy.asarray(indices)
+    depth = 8 if indices.dtype == numpy.uint8 else 32
+    image = pygame.Surface((indices.shape[1], indices.shape[0]), 0, depth)
+    pygame.surfarray.blit_array(image, indices[::-1].T)
+    return pygame.transform.scale(image, rect.size)
+
+def blockBoundaries(rows, cols, x, y, w, h):
+    """
+    Return a 2D array of the pixels of the rectangle of width w and
+    height h whose lower left point is (x, y), which is 1 on the
+    boundaries of the blocks that indexedImage() draws for an array
+    of the given rows and columns on the same rectangle and 0 on the
+    other pixels. The boundaries are as thick as the current pen
+    radius as in square(). The array is indexed by [x][y] in pixels
+    from the top left corner as in pygame.surfarray.
+    """
+    rect = pixelRect(x, y, w, h)
+    blocks = numpy.arange(rows * cols).reshape(rows, cols)
+    blocks = pygame.surfarray.array2d(_scaledIndices(blocks, rect)).astype(numpy.int64)
+    # a pixel is on a boundary if a pixel of another block (or outside
+    # the rectangle) is that close to it along either axis
+    width = max(1, int(round(_penRadius)))
+    padded = numpy.pad(blocks, width, constant_values=-1)
+    mask = numpy.zeros(blocks.shape, dtype=bool)
+    sx, sy = blocks.shape
+    for d in range(1, width + 1):
+        for (dx, dy) in ((-d, 0), (d, 0), (0, -d), (0, d)):
+            mask |= padded[width+dx:width+dx+sx, width+dy:width+dy+sy] != blocks
+    # keep the array in the memory order of the pixels of the surfaces
+    return numpy.asfortranarray(mask, dtype=numpy.uint8)
+
+def indexedImage(indices, palette, x, y, w, h, pattern=None):
+    """
+    Draw the 2D array of palette indices on the rectangle of width w
+    and height h whose lower left point is (x, y), the first row of the
+    array is the bottom row of the rectangle. The array is drawn as a
+    block of pixels for every index in its color in the palette (a list
+    of at most 256 objects of class color.Color) by scaling it once.
+    The pixels with index 0 are not drawn. If pattern is given, it is
+    a 2D array in pixels (indexed as in pygame.surfarray) that is added
+    to the indices of the other pixels after the scaling (e.g. the
+    array returned by blockBoundaries() times an offset to draw the
+    boundaries of the blocks with other colors of the palette).
+    """
+    _makeSureWindowCreated()
+    rect = pixelRect(x, y, w, h)
+    image = _scaledIndices(numpy.asarray(indices, dtype=numpy.uint8), rect)
+    image.set_palette([_pygameColor(c) for c in palette])
+    if pattern is not None:
+        pixels = pygame.surfarray.pixels2d(image)
+        pixels += pattern * (pixels != 0)
+        del pixels
+    image.set_colorkey(_pygameColor(palette[0]))
+    _surface.blit(image, rect)
+
+#---------------------------------------------------------------
+# End added by Ege Kaan Isik
+#---------------------------------------------------------------
+
 def clear(c=WHITE):
     """
     Clear the background canvas to color c, where c is an
     object of class color.Color. c defaults to stddraw.WHITE.
     """
+    global _clearCount
     _makeSureWindowCreated()
     _surface.fill(_pygameColor(c))
+    _clearCount += 1
 
 def save(f):
     """
@@ -613,6 +902,8 @@ def show(msec=float('inf')):
     """
     Copy the background canvas to the window canvas, and
     then wait for msec milliseconds. msec defaults to infinity.
+    If a frame rate is set, show(0) waits until the next frame
+    is due instead of returning at once.
     """
     if msec == float('inf'):
         _showAndWaitForever()
@@ -620,19 +911,77 @@ def show(msec=float('inf')):
     _makeSureWindowCreated()
     _show()
     _checkForEvents()
+    _wait(msec)
 
-    # Sleep for the required time, but check for events every
-    # QUANTUM seconds.
-    QUANTUM = .01
-    sec = msec / 1000.0
-    if sec < QUANTUM:
-        time.sleep(sec)
+#---------------------------------------------------------------
+# Begin added by Ege Kaan Isik
+#---------------------------------------------------------------
+
+def showRects(rects, msec=0):
+    """
+    Copy only the given rectangles (in pixels, e.g. returned by
+    pixelRect()) of the background canvas to the window canvas, and
+    then wait for msec milliseconds as show() does.
+    """
+    _makeSureWindowCreated()
+    for rect in rects:
+        _background.blit(_surface, rect, rect)
+    if len(rects) != 0:
+        pygame.display.update(rects)
+    _checkForEvents()
+    _wait(msec)
+
+def _wait(msec):
+    """
+    Wait for msec milliseconds, or until the next frame is due if
+    msec is 0 and the frame rate is limited.
+    """
+    if msec <= 0:
+        if _frameRate is not None:
+            _frameClock.tick(_frameRate)
         return
-    secondsWaited = 0.0
-    while secondsWaited < sec:
-        time.sleep(QUANTUM)
-        secondsWaited += QUANTUM
+
+    # Sleep until the required time is over, but check for events
+    # every QUANTUM seconds.
+    QUANTUM = .01
+    end = time.time() + msec / 1000.0
+    while True:
+        remaining = end - time.time()
+        if remaining <= 0:
+            break
+        time.sleep(min(QUANTUM, remaining))
         _checkForEvents()
+    if _frameClock is not None:
+        _frameClock.tick()
+
+def waitForEvents(msec):
+    """
+    Wait until a new event occurs (such as a key typed, a button
+    pressed or the mouse moved) or msec milliseconds pass, without
+    using the CPU in the meantime. Return True if an event occured.
+    """
+    _makeSureWindowCreated()
+    event = pygame.event.wait(int(msec))
+    if event.type == pygame.NOEVENT:
+        return False
+    _checkForEvents([event] + pygame.event.get())
+    return True
+
+def setFrameRate(fps=None):
+    """
+    Set the maximum number of frames shown per second to fps, so
+    that a loop calling show(0) does not use a whole CPU core.
+    There is no limit if fps is None.
+    """
+    global _frameRate
+    global _frameClock
+    _frameRate = fps
+    if _frameClock is None:
+        _frameClock = pygame.time.Clock()
+
+#---------------------------------------------------------------
+# End added by Ege Kaan Isik
+#---------------------------------------------------------------
 
 #-----------------------------------------------------------------------
 
@@ -673,10 +1022,11 @@ def _saveToFile():
         childProcess = subprocess.Popen(
             [sys.executable, stddrawPath, 'reportFileSaveError', str(e)])
 
-def _checkForEvents():
+def _checkForEvents(events=None):
     """
     Check if any new event has occured (such as a key typed or button
     pressed).  If a key has been typed, then put that key in a queue.
+    The events can be given if they are already taken from pygame.
     """
     global _surface
     global _keysTyped
@@ -703,7 +1053,9 @@ def _checkForEvents():
     #-------------------------------------------------------------------
     
     _makeSureWindowCreated()
-    for event in pygame.event.get():
+    if events is None:
+        events = pygame.event.get()
+    for event in events:
         if event.type == pygame.QUIT:
             func = _close_action
             func(*_close_args)
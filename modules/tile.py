@@ -7,7 +7,6 @@ import os
 # add the current directory to the system path
 sys.path.append(os.path.dirname(os.path.realpath(__file__)))
 
-import stddraw # the stddraw module is used as a basic graphics library
 from color import Color # used for coloring the tile and the number on it
 from point import Point # used for representing the position of the tile
 import random # used for getting random objects
@@ -157,26 +156,6 @@ class Tile:
       # change the boundary color
       self.boundary_color = Color(188,174,161)
 
-   # Method for drawing the tile
-   def draw(self):
-      # draw the tile as a filled square
-      if self.background_color == None or self.boundary_color == None:
-         return
-      stddraw.setPenColor(self.background_color)
-      stddraw.filledSquare(self.position.x, self.position.y, 0.5)
-      # draw the bounding box of the tile as a square
-      stddraw.setPenColor(self.boundary_color)
-      stddraw.setPenRadius(Tile.boundary_thickness)
-      stddraw.square(self.position.x, self.position.y, 0.5)
-      stddraw.setPenRadius()  # reset the pen radius to its default value
-
-      # draw the number on the tile
-      if self.gamemode == "2048" and self.ghost == False:
-         stddraw.setPenColor(self.foreground_color)
-         stddraw.setFontFamily(Tile.font_family)
-         stddraw.setFontSize(Tile.font_size)
-         stddraw.boldText(self.position.x, self.position.y, str(self.number))
-   
    # Method for copying the tile, user can specify a new position to the copied tile 
    def copy(self, position=None, ghost=None):
       gh = ghost if ghost is not None else self.ghost
@@ -0,0 +1,342 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import os
+
+# add the current directory to the system path
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import numpy as np # fundamental Python module for scientific computing
+from tetromino import ORIENTATIONS, TETROMINO_TYPES # the orientation tables and the types of the tetrominoes
+from game_engine import ACTIONS # the actions that can be taken in every step
+from piece_generator import PieceGenerator, RANDOMIZERS # class for creating the tetrominoes from a seed, and the ways
+# of choosing their types
+
+# the (x, y) offsets of the four cells of every tetromino type and orientation as (type, orientation, cell) arrays,
+# the cells are in the same order as the values of the tetromino cells
+CELL_X = np.array([[[x for (x, y) in ORIENTATIONS[type][i].cells] for i in range(4)] for type in TETROMINO_TYPES])
+CELL_Y = np.array([[[y for (x, y) in ORIENTATIONS[type][i].cells] for i in range(4)] for type in TETROMINO_TYPES])
+# the bounds of the cells of every tetromino type and orientation as (type, orientation) arrays
+MIN_X = CELL_X.min(axis=2)
+MAX_X = CELL_X.max(axis=2)
+MIN_Y = CELL_Y.min(axis=2)
+# the tallest board that fits the occupancy masks of its columns into 64-bit integers with a free bit above the
+# top row
+MAX_HEIGHT = 63
+# the number of the upcoming tetrominoes that are created at once for a board
+QUEUE_LENGTH = 64
+# the scores of clearing 0 to 4 lines at once in classic tetris mode (multiplied by the difficulty + 1)
+LINE_SCORES = np.array([0, 40, 100, 300, 1200])
+
+# Class used for playing many games in lockstep. The boards of the games are held as a single (B, height, width)
+# array with the same cell values as the game grid, and every step applies one action to every board at once.
+# Every board has its own piece generator for creating its tetrominoes in bulk, seeded from the given seed.
+class VectorEnv:
+   # Constructor that creates the given number of games with the given game mode and difficulty, the tetromino
+   # types are chosen by the given randomizer ("uniform" or "bag")
+   def __init__(self, num_boards, gamemode, difficulty, seed=None, grid_h=20, grid_w=12, randomizer="uniform"):
+      if randomizer not in RANDOMIZERS:
+         raise ValueError("Unknown randomizer: " + str(randomizer))
+      if grid_h > MAX_HEIGHT:
+         raise ValueError("The grid height can be at most " + str(MAX_HEIGHT))
+      self.num_boards = num_boards
+      self.gamemode = gamemode
+      self.difficulty = difficulty
+      self.randomizer = randomizer
+      self.grid_height = grid_h
+      self.grid_width = grid_w
+      self.reset(seed)
+
+   # Method for starting new games on every board, returns the boards
+   def reset(self, seed=None):
+      B, H, W = self.num_boards, self.grid_height, self.grid_width
+      # create a piece generator with an independent seed for every board, so the tetrominoes of a board do not
+      # depend on the other boards
+      seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(B)]
+      self.generators = [PieceGenerator(H, W, self.gamemode, s, self.randomizer, preview=0) for s in seeds]
+      # the cells of the boards
+      self.boards = np.zeros((B, H, W), dtype=np.uint8)
+      # the type index, orientation, bottom-left corner and cell values of the current tetromino of every board
+      self.types = np.zeros(B, dtype=np.int64)
+      self.orientations = np.zeros(B, dtype=np.int64)
+      self.xs = np.zeros(B, dtype=np.int64)
+      self.ys = np.zeros(B, dtype=np.int64)
+      self.values = np.zeros((B, 4), dtype=np.uint8)
+      # the queues of the upcoming tetrominoes of every board as their type indexes, columns and cell values,
+      # the tetrominoes are created in bulk and the queue of a board starts from its queue start
+      self.queue_types = np.zeros((B, QUEUE_LENGTH), dtype=np.int64)
+      self.queue_xs = np.zeros((B, QUEUE_LENGTH), dtype=np.int64)
+      self.queue_values = np.zeros((B, QUEUE_LENGTH, 4), dtype=np.uint8)
+      self.queue_start = np.full(B, QUEUE_LENGTH, dtype=np.int64)
+      # the scores and the states of the games
+      self.scores = np.zeros(B, dtype=np.int64)
+      self.lines_cleared = np.zeros(B, dtype=np.int64)
+      self.reached_2048 = np.zeros(B, dtype=bool)
+      self.done = np.zeros(B, dtype=bool)
+      # create the current tetromino of every board
+      self.spawn(np.arange(B))
+      return self.boards
+
+   # Method for filling the queues of the upcoming tetrominoes of the given boards with new tetrominoes
+   def fill_queues(self, boards):
+      n, count = len(boards), QUEUE_LENGTH
+      # create the used number of tetrominoes for every board in bulk by its piece generator
+      start = self.queue_start[boards]
+      types = np.zeros((n, count), dtype=np.int64)
+      xs = np.zeros((n, count), dtype=np.int64)
+      values = np.zeros((n, count, 4), dtype=np.uint8)
+      for i, (board, used) in enumerate(zip(boards.tolist(), start.tolist())):
+         types[i, :used], xs[i, :used], values[i, :used] = self.generators[board].bulk(used)
+      # keep the tetrominoes that are not used yet at the start of the queues and add the new ones after them
+      indexes = start[:, None] + np.arange(count)
+      self.queue_types[boards] = np.take_along_axis(np.concatenate([self.queue_types[boards], types], axis=1),
+                                                    indexes, axis=1)
+      self.queue_xs[boards] = np.take_along_axis(np.concatenate([self.queue_xs[boards], xs], axis=1), indexes, axis=1)
+      self.queue_values[boards] = np.take_along_axis(np.concatenate([self.queue_values[boards], values], axis=1),
+                                                     indexes[:, :, None], axis=1)
+      self.queue_start[boards] = 0
+
+   # Method for making the first upcoming tetromino the current tetromino of the given boards
+   def spawn(self, boards):
+      # fill the queues that do not have the next three tetrominoes after the current one
+      empty = boards[self.queue_start[boards] + 4 > QUEUE_LENGTH]
+      if len(empty) != 0:
+         self.fill_queues(empty)
+      start = self.queue_start[boards]
+      self.types[boards] = self.queue_types[boards, start]
+      self.xs[boards] = self.queue_xs[boards, start]
+      self.ys[boards] = self.grid_height
+      self.orientations[boards] = 0
+      self.values[boards] = self.queue_values[boards, start]
+      self.queue_start[boards] += 1
+
+   # Method for getting the type indexes, columns and cell values of the three upcoming tetrominoes of every board
+   def upcoming(self):
+      indexes = self.queue_start[:, None] + np.arange(3)
+      rows = np.arange(self.num_boards)[:, None]
+      return self.queue_types[rows, indexes], self.queue_xs[rows, indexes], self.queue_values[rows, indexes]
+
+   # Method for checking whether the current tetrominoes of the given boards fit on the given orientations and
+   # positions, the cells above the boards are free
+   def fits(self, boards, orientations, xs, ys):
+      H, W = self.grid_height, self.grid_width
+      types = self.types[boards]
+      cols = xs[:, None] + CELL_X[types, orientations]
+      rows = ys[:, None] + CELL_Y[types, orientations]
+      inside = (cols >= 0) & (cols < W) & (rows >= 0)
+      # the cells are read from the flattened boards, the cells out of the boards are read from the other cells (or
+      # clipped to the ends of the array), then ignored
+      occupied = self.boards.ravel().take((boards[:, None] * H + rows) * W + cols, mode="clip") != 0
+      return (inside & ~(occupied & (rows < H))).all(axis=1)
+
+   # Method for getting how many rows the current tetrominoes of the given boards can go down, every cell can go
+   # down until the highest occupied cell below it in its column
+   def drop_distances(self, boards):
+      H, W = self.grid_height, self.grid_width
+      types, orientations = self.types[boards], self.orientations[boards]
+      cols = self.xs[boards, None] + CELL_X[types, orientations]
+      rows = self.ys[boards, None] + CELL_Y[types, orientations]
+      # the occupied cells of the columns of the tetromino cells as (boards, cells, rows) arrays
+      heights = np.arange(H)
+      occupied = self.boards.ravel().take(((boards[:, None, None] * H + heights) * W + cols[:, :, None])) != 0
+      below = np.where(occupied & (heights < rows[:, :, None]), heights, -1).max(axis=2)
+      return (rows - below - 1).min(axis=1)
+
+   # Method for applying one action to every board, the actions are given by their names or their indexes in
+   # ACTIONS. Returns the boards, the score changes and whether the games are over.
+   def step(self, actions):
+      actions = np.asarray(actions)
+      if actions.dtype.kind in "UO":
+         actions = np.array([ACTIONS.index(a) for a in actions])
+      scores = self.scores.copy()
+      playing = ~self.done
+      W = self.grid_width
+      locking = []
+
+      # move the tetrominoes left or right by one cell
+      for name, dx in (("left", -1), ("right", 1)):
+         b = np.flatnonzero(playing & (actions == ACTIONS.index(name)))
+         b = b[self.fits(b, self.orientations[b], self.xs[b] + dx, self.ys[b])]
+         self.xs[b] += dx
+
+      # rotate the tetrominoes, move them back into the boards when they go beyond the limits
+      b = np.flatnonzero(playing & (actions == ACTIONS.index("rotate")))
+      types, orientations = self.types[b], (self.orientations[b] + 1) % 4
+      ys = np.maximum(self.ys[b], -MIN_Y[types, orientations])
+      xs = np.minimum(self.xs[b], W - 1 - MAX_X[types, orientations])
+      xs = np.maximum(xs, -MIN_X[types, orientations])
+      rotated = self.fits(b, orientations, xs, ys)
+      b = b[rotated]
+      self.orientations[b], self.xs[b], self.ys[b] = orientations[rotated], xs[rotated], ys[rotated]
+
+      # move the tetrominoes down by one cell and increase the scores by 1 if they can go down
+      b = np.flatnonzero(playing & (actions == ACTIONS.index("soft_drop")))
+      b = b[self.fits(b, self.orientations[b], self.xs[b], self.ys[b] - 1)]
+      self.ys[b] -= 1
+      self.scores[b] += 1
+
+      # move the tetrominoes down by one cell, place them if they cannot go down anymore
+      b = np.flatnonzero(playing & (actions == ACTIONS.index("gravity")))
+      down = self.fits(b, self.orientations[b], self.xs[b], self.ys[b] - 1)
+      self.ys[b[down]] -= 1
+      locking.append(b[~down])
+
+      # move the tetrominoes all the way down, increase the scores by line count * 2 and place them
+      b = np.flatnonzero(playing & (actions == ACTIONS.index("hard_drop")))
+      distances = self.drop_distances(b)
+      self.ys[b] -= distances
+      self.scores[b] += distances * 2
+      locking.append(b)
+
+      locking = np.sort(np.concatenate(locking))
+      if len(locking) != 0:
+         self.lock(locking)
+      return self.boards, self.scores - scores, self.done.copy()
+
+   # Method for placing the current tetrominoes of the given boards, resolving the merges and line clears, and
+   # getting the next tetrominoes
+   def lock(self, boards):
+      H = self.grid_height
+      cols = self.xs[boards, None] + CELL_X[self.types[boards], self.orientations[boards]]
+      rows = self.ys[boards, None] + CELL_Y[self.types[boards], self.orientations[boards]]
+      # the game is over if any placed tile is out of the board
+      outside = (rows >= H).any(axis=1)
+      self.done[boards[outside]] = True
+      inside = rows < H
+      self.boards[np.repeat(boards, 4).reshape(-1, 4)[inside], rows[inside], cols[inside]] = self.values[boards][inside]
+      boards = boards[~outside]
+      if len(boards) == 0:
+         return
+
+      cells = self.boards[boards]
+      scores = np.zeros(len(boards), dtype=np.int64)
+      # do chain merging and line clearing until it cannot if the game mode is 2048, only the boards that have
+      # deleted tiles can have floating tiles
+      if self.gamemode == "2048":
+         changed = np.zeros(len(boards), dtype=bool)
+         while True:
+            self.chain_merge(cells, scores, boards, changed)
+            changed = self.delete_full_lines(cells, scores, boards)
+            if not changed.any():
+               break
+      # check the lines only if the game mode is tetris
+      else:
+         self.delete_full_lines(cells, scores, boards)
+      self.boards[boards] = cells
+      self.scores[boards] += scores * (self.difficulty + 1)
+      self.spawn(boards)
+
+   # Method for deleting the full lines of the given cells of the boards, returns which boards had full lines
+   def delete_full_lines(self, cells, scores, boards):
+      full = (cells != 0).all(axis=2)
+      counts = full.sum(axis=1)
+      cleared = counts != 0
+      if not cleared.any():
+         return cleared
+      # update the scores
+      if self.gamemode == "tetris":
+         scores += LINE_SCORES[np.minimum(counts, 4)]
+      else:
+         scores += (np.left_shift(1, cells.astype(np.int64)) * full[:, :, None]).sum(axis=(1, 2))
+      self.lines_cleared[boards] += counts
+      # move the remaining lines down in their order and add empty lines on the top of the boards
+      order = np.argsort(full, axis=1, kind="stable")
+      cells[:] = np.take_along_axis(cells, order[:, :, None], axis=1)
+      cells[np.arange(self.grid_height)[None, :] >= (self.grid_height - counts)[:, None]] = 0
+      return cleared
+
+   # Method for merging the tiles that have the same number and on top of each other on the given cells of the
+   # boards, and moving down the floating tiles until there is no merging to happen. The floating tiles are only
+   # checked on the boards that have deleted tiles, the changed boards are given.
+   def chain_merge(self, cells, scores, boards, changed):
+      # the boards that are checked for the pairs, only the boards that had pairs or tiles that fell can have
+      # pairs again
+      active = np.arange(len(cells))
+      while True:
+         while len(active) != 0:
+            # find the bottommost pair of the tiles that have the same number in every column
+            checked = cells[active]
+            lower, upper = checked[:, :-1], checked[:, 1:]
+            pairs = (lower == upper) & (lower != 0)
+            has_pair = pairs.any(axis=1)
+            n, c = np.nonzero(has_pair)
+            if len(n) == 0:
+               break
+            r = pairs[n, :, c].argmax(axis=1)
+            n = active[n]
+            active = active[has_pair.any(axis=1)]
+            # double the numbers of the bottom tiles and delete the upper tiles
+            cells[n, r, c] += 1
+            cells[n, r + 1, c] = 0
+            merged = cells[n, r, c]
+            np.add.at(scores, n, np.left_shift(1, merged.astype(np.int64)))
+            self.reached_2048[boards[n[merged == 11]]] = True
+            changed[n] = True
+         # move down the floating tiles of the changed boards, check the boards again if any tile fell
+         indexes = np.flatnonzero(changed)
+         if len(indexes) == 0:
+            break
+         settled = cells[indexes]
+         fell = self.move_floating_tiles(settled)
+         cells[indexes] = settled
+         changed = np.zeros_like(changed)
+         changed[indexes[fell]] = True
+         active = indexes[fell]
+         if not fell.any():
+            break
+
+   # Method for moving down the tiles that are not connected to the bottom of the given cells of the boards,
+   # every floating tile falls until it reaches a tile or the bottom. Returns which boards had tiles that fell.
+   def move_floating_tiles(self, cells):
+      N, H, W = cells.shape
+      occupied = cells != 0
+      fell = np.zeros(N, dtype=bool)
+      # only the boards that have a tile over an empty cell can have floating tiles, the others are not checked
+      boards = np.flatnonzero((occupied[:, 1:] & ~occupied[:, :-1]).any(axis=(1, 2)))
+      if len(boards) == 0:
+         return fell
+      checked = cells[boards]
+      occupied = occupied[boards]
+      # flood fill the tiles that are connected to the bottom row on the occupancy masks of the columns, the bit of
+      # a row is set if its cell is occupied
+      packed = np.packbits(np.ascontiguousarray(occupied.transpose(0, 2, 1)), axis=2, bitorder="little")
+      # pad the masks to the closest integer size (1, 2, 4 or 8 bytes) with a free bit above the top row, and view
+      # them as integers
+      size = 1 << (H // 8).bit_length()
+      masks = np.zeros((len(boards), W, size), dtype=np.uint8)
+      masks[:, :, :packed.shape[2]] = packed
+      masks = masks.view("<u" + str(size))[:, :, 0]
+      connected = masks & 1
+      while True:
+         # fill the runs of the occupied cells above the connected tiles in the columns at once, the carries of the
+         # addition go up the runs, then grow by one cell downwards and to the left and right
+         up = (((masks + connected) ^ masks ^ connected) >> 1) | connected
+         grown = up | (up >> 1)
+         grown[:, 1:] |= up[:, :-1]
+         grown[:, :-1] |= up[:, 1:]
+         grown &= masks
+         if (grown == connected).all():
+            break
+         connected = grown
+      connected = np.unpackbits(connected[:, :, None].view(np.uint8), axis=2, count=H, bitorder="little")
+      connected = connected.view(bool).transpose(0, 2, 1)
+      floating = occupied & ~connected
+      # only the boards that have floating tiles are changed
+      moved = np.flatnonzero(floating.any(axis=(1, 2)))
+      if len(moved) == 0:
+         return fell
+      boards, checked, connected, floating = boards[moved], checked[moved], connected[moved], floating[moved]
+      # a floating tile falls onto the closest connected tile below it and the floating tiles between them
+      rows = np.arange(H, dtype=np.int16)[None, :, None]
+      below = np.maximum.accumulate(np.where(connected, rows, -1), axis=1)
+      stacked = np.cumsum(floating, axis=1, dtype=np.int16)
+      stacked -= np.maximum.accumulate(np.where(connected, stacked, 0), axis=1)
+      n, r, c = np.nonzero(floating)
+      targets = (below + stacked)[n, r, c]
+      values = checked[n, r, c]
+      checked[n, r, c] = 0
+      checked[n, targets, c] = values
+      cells[boards] = checked
+      fell[boards[n[targets != r]]] = True
+      return fell